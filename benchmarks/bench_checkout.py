@@ -0,0 +1,195 @@
+"""Benchmark suite untuk CheckoutService.run_checkout.
+
+Menjalankan run_checkout dengan CreditCardProcessor dan QrisProcessor
+(ditambah latensi gateway simulasi) serta EmailNotifier terhadap aliran
+Order sintetis dengan berbagai ukuran. Untuk setiap kombinasi dilaporkan
+throughput, latensi p50/p95/p99, dan alokasi memori per checkout. Hasil
+disimpan sebagai JSON agar beberapa run dapat dibandingkan.
+
+Cara menjalankan:
+    python benchmarks/bench_checkout.py --sizes 1000,5000 \\
+        --latencies 0,0.0005 --output bench_results.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from refactor_solid import (  # noqa: E402
+    CheckoutService,
+    CreditCardProcessor,
+    EmailNotifier,
+    IPaymentProcessor,
+    Order,
+    QrisProcessor,
+    SimulatedLatencyProcessor,
+    set_order_logging,
+)
+
+PROCESSORS = {
+    "card": CreditCardProcessor,
+    "qris": QrisProcessor,
+}
+
+# Jumlah checkout yang diukur dengan tracemalloc, karena tracemalloc
+# memperlambat eksekusi secara signifikan
+ALLOCATION_SAMPLE = 500
+
+
+def synthetic_orders(count: int) -> List[Order]:
+    """Membuat aliran Order sintetis.
+    
+    Args:
+        count: Jumlah pesanan
+        
+    Returns:
+        List Order dengan nama pelanggan dan harga bervariasi
+    """
+    return [Order(f"customer-{i % 997}", 1_000 + (i * 7919) % 5_000_000) for i in range(count)]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Menghitung persentil dengan metode nearest-rank.
+    
+    Args:
+        sorted_values: Nilai yang sudah diurutkan
+        pct: Persentil antara 0 dan 100
+        
+    Returns:
+        Nilai pada persentil tersebut
+    """
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def measure_allocations(service: CheckoutService, count: int) -> Dict[str, float]:
+    """Mengukur alokasi memori per checkout dengan tracemalloc.
+    
+    Args:
+        service: CheckoutService yang diukur
+        count: Jumlah checkout sampel
+        
+    Returns:
+        Rata-rata byte puncak sementara dan byte yang tertahan per checkout
+    """
+    orders = synthetic_orders(count)
+    tracemalloc.start()
+    start_current, _ = tracemalloc.get_traced_memory()
+    peak_total = 0
+    for order in orders:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        service.run_checkout(order)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - before
+    end_current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "alloc_peak_bytes_per_checkout": peak_total / count,
+        "retained_bytes_per_checkout": (end_current - start_current) / count,
+    }
+
+
+def run_case(processor_name: str, size: int, latency: float) -> Dict[str, float]:
+    """Menjalankan satu kombinasi processor, ukuran, dan latensi.
+    
+    Args:
+        processor_name: Kunci di PROCESSORS
+        size: Jumlah pesanan
+        latency: Latensi gateway simulasi dalam detik
+        
+    Returns:
+        Dictionary berisi hasil pengukuran
+    """
+    processor: IPaymentProcessor = PROCESSORS[processor_name]()
+    if latency > 0:
+        processor = SimulatedLatencyProcessor(processor, lambda: latency)
+    service = CheckoutService(payment_processor=processor, notifier=EmailNotifier())
+    orders = synthetic_orders(size)
+    
+    timings = []
+    record = timings.append
+    clock = time.perf_counter
+    failures = 0
+    start = clock()
+    for order in orders:
+        t0 = clock()
+        if not service.run_checkout(order):
+            failures += 1
+        record(clock() - t0)
+    elapsed = clock() - start
+    timings.sort()
+    
+    result = {
+        "processor": processor_name,
+        "orders": size,
+        "latency_s": latency,
+        "failures": failures,
+        "elapsed_s": elapsed,
+        "throughput_per_s": size / elapsed,
+        "p50_ms": percentile(timings, 50) * 1e3,
+        "p95_ms": percentile(timings, 95) * 1e3,
+        "p99_ms": percentile(timings, 99) * 1e3,
+    }
+    result.update(measure_allocations(service, min(size, ALLOCATION_SAMPLE)))
+    return result
+
+
+def parse_list(value: str, cast):
+    return [cast(item) for item in value.split(",") if item]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,5000",
+                        help="Ukuran aliran pesanan, dipisah koma")
+    parser.add_argument("--latencies", default="0,0.0005",
+                        help="Latensi gateway simulasi dalam detik, dipisah koma")
+    parser.add_argument("--processors", default=",".join(PROCESSORS),
+                        help="Processor yang diukur, dipisah koma")
+    parser.add_argument("--output", default=None,
+                        help="Lokasi file JSON untuk menyimpan hasil")
+    parser.add_argument("--order-logging", action="store_true",
+                        help="Aktifkan log per pesanan selama pengukuran")
+    args = parser.parse_args()
+    
+    logging.getLogger().setLevel(logging.WARNING)
+    set_order_logging(args.order_logging)
+    
+    results = []
+    header = f"{'processor':<10}{'orders':>8}{'latency':>10}{'ops/s':>12}" \
+             f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'alloc B':>10}"
+    print(header)
+    print("-" * len(header))
+    for processor_name in parse_list(args.processors, str):
+        for size in parse_list(args.sizes, int):
+            for latency in parse_list(args.latencies, float):
+                result = run_case(processor_name, size, latency)
+                results.append(result)
+                print(f"{processor_name:<10}{size:>8}{latency:>10.4f}"
+                      f"{result['throughput_per_s']:>12.0f}{result['p50_ms']:>10.3f}"
+                      f"{result['p95_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+                      f"{result['alloc_peak_bytes_per_checkout']:>10.0f}")
+    
+    if args.output:
+        report = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark overhead logging pada jalur checkout.
+
+Mengukur waktu rata-rata CheckoutService.run_checkout dengan log per
+pesanan aktif dan nonaktif (set_order_logging). Output log diarahkan ke
+buffer di memori agar yang terukur adalah biaya logging, bukan terminal.
+
+Cara menjalankan:
+    python benchmarks/bench_logging.py [jumlah_pesanan]
+"""
+import io
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from refactor_solid import (  # noqa: E402
+    CheckoutService,
+    CreditCardProcessor,
+    EmailNotifier,
+    Order,
+    set_order_logging,
+)
+
+
+def measure(service: CheckoutService, count: int) -> float:
+    """Mengukur rata-rata mikrodetik per run_checkout.
+    
+    Args:
+        service: CheckoutService yang diukur
+        count: Jumlah pesanan yang diproses
+        
+    Returns:
+        Rata-rata waktu per checkout dalam mikrodetik
+    """
+    orders = [Order(f"customer-{i}", i * 100) for i in range(count)]
+    start = time.perf_counter()
+    for order in orders:
+        service.run_checkout(order)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    sink = logging.StreamHandler(io.StringIO())
+    sink.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    root.addHandler(sink)
+    root.setLevel(logging.INFO)
+    
+    service = CheckoutService(CreditCardProcessor(), EmailNotifier())
+    set_order_logging(True)
+    enabled = measure(service, count)
+    set_order_logging(False)
+    disabled = measure(service, count)
+    
+    print(f"Orders per run       : {count}")
+    print(f"Order logging on     : {enabled:8.2f} us/checkout")
+    print(f"Order logging off    : {disabled:8.2f} us/checkout")
+    print(f"Speedup              : {enabled / disabled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark memori per Order.
+
+Membandingkan Order berbasis __slots__ (status enum, harga integer sen)
+dengan representasi lama berbasis dataclass biasa (status string, harga
+float) dan mencetak jumlah byte yang dihemat per pesanan.
+
+Cara menjalankan:
+    python benchmarks/bench_order_memory.py [jumlah_pesanan]
+"""
+from dataclasses import dataclass
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from refactor_solid import Order  # noqa: E402
+
+
+@dataclass
+class LegacyOrder:
+    """Representasi Order sebelum menggunakan __slots__."""
+    customer_name: str
+    total_price: float
+    status: str = "open"
+
+
+def measure(factory, count: int) -> float:
+    """Mengukur rata-rata byte yang dialokasikan per pesanan.
+    
+    Args:
+        factory: Callable yang membuat satu pesanan dari sebuah index
+        count: Jumlah pesanan yang dibuat
+        
+    Returns:
+        Rata-rata byte per pesanan
+    """
+    # Nama pelanggan dibuat di luar pengukuran agar hanya objek pesanan
+    # yang dihitung
+    names = [f"customer-{i % 1000}" for i in range(count)]
+    tracemalloc.start()
+    orders = [factory(name, i) for i, name in enumerate(names)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del orders
+    return current / count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # "open".upper().lower() meniru string status hasil parsing yang
+    # tidak di-intern
+    legacy = measure(
+        lambda name, i: LegacyOrder(name, float(i) + 0.5, "open".upper().lower()),
+        count
+    )
+    compact = measure(lambda name, i: Order(name, i * 100 + 50), count)
+    print(f"Orders measured : {count}")
+    print(f"Legacy dataclass: {legacy:8.1f} bytes/order")
+    print(f"Slotted Order   : {compact:8.1f} bytes/order")
+    print(f"Saved           : {legacy - compact:8.1f} bytes/order "
+          f"({(1 - compact / legacy) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Pemeriksaan regresi waktu import refactor_solid.
+
+Menjalankan `python -X importtime -c "import refactor_solid"` di beberapa
+proses baru, mengambil waktu kumulatif baris refactor_solid, lalu
+membandingkan mediannya dengan anggaran cold start. Skrip juga memastikan
+modul berat yang seharusnya diimpor secara lazy tidak ikut termuat dan
+bahwa import tidak memasang handler logging. Exit code bukan nol jika ada
+regresi, sehingga skrip dapat dipakai di CI.
+
+Dengan --no-bytecode, setiap proses memakai PYTHONPYCACHEPREFIX kosong dan
+tidak menulis .pyc, sehingga seluruh import (termasuk stdlib) dikompilasi
+ulang seperti pada container baru tanpa cache bytecode.
+
+Cara menjalankan:
+    python benchmarks/check_import_time.py --runs 15 --budget-ms 80
+    python benchmarks/check_import_time.py --no-bytecode
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE = "refactor_solid"
+
+# Anggaran default median waktu import dalam ms, dengan dan tanpa cache .pyc
+DEFAULT_BUDGET_MS = 80.0
+DEFAULT_NO_BYTECODE_BUDGET_MS = 400.0
+
+# Modul yang hanya boleh diimpor oleh komponen opsional yang memakainya
+LAZY_MODULES = (
+    "argparse",
+    "asyncio",
+    "concurrent.futures",
+    "csv",
+    "json",
+    "logging.handlers",
+    "multiprocessing",
+    "queue",
+    "random",
+    "sqlite3",
+    "uuid",
+)
+
+PROBE = (
+    "import logging, sys\n"
+    f"import {MODULE}\n"
+    f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))\n"
+    "print(len(logging.getLogger().handlers))\n"
+)
+
+
+def child_env(bytecode_cache: bool, pycache_prefix: str) -> dict:
+    """Menyiapkan environment untuk proses anak.
+
+    Args:
+        bytecode_cache: True agar proses anak menulis/memakai file .pyc
+            seperti pada deployment biasa, False untuk mengukur import
+            tanpa cache (termasuk waktu kompilasi)
+        pycache_prefix: Direktori kosong untuk PYTHONPYCACHEPREFIX, sehingga
+            .pyc yang sudah ada di __pycache__ tidak ikut terpakai
+
+    Returns:
+        Salinan os.environ dengan PYTHONPATH yang menunjuk ke root repo
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env["PYTHONPYCACHEPREFIX"] = pycache_prefix
+    if bytecode_cache:
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+    else:
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def measure_once(env: dict) -> float:
+    """Mengukur waktu import kumulatif refactor_solid di proses baru.
+
+    Args:
+        env: Environment proses anak
+
+    Returns:
+        Waktu import kumulatif dalam milidetik
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == MODULE:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"{MODULE} not found in -X importtime output")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15,
+                        help="Jumlah proses baru yang diukur (default: 15)")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Anggaran median waktu import dalam ms (default: "
+                             f"{DEFAULT_BUDGET_MS:g}, atau {DEFAULT_NO_BYTECODE_BUDGET_MS:g} "
+                             "dengan --no-bytecode)")
+    parser.add_argument("--no-bytecode", action="store_true",
+                        help="Ukur tanpa cache .pyc (termasuk waktu kompilasi)")
+    args = parser.parse_args()
+    if args.budget_ms is None:
+        args.budget_ms = DEFAULT_NO_BYTECODE_BUDGET_MS if args.no_bytecode else DEFAULT_BUDGET_MS
+
+    with tempfile.TemporaryDirectory(prefix="pycache-") as pycache_prefix:
+        env = child_env(not args.no_bytecode, pycache_prefix)
+        # Run pemanasan agar cache .pyc (jika dipakai) dan page cache terisi
+        measure_once(env)
+        samples: List[float] = sorted(measure_once(env) for _ in range(args.runs))
+        probe = subprocess.run(
+            [sys.executable, "-c", PROBE], env=env,
+            capture_output=True, text=True, check=True,
+        ).stdout.splitlines()
+    median = statistics.median(samples)
+    loaded = [name for name in probe[0].split(",") if name]
+    root_handlers = int(probe[1])
+
+    print(f"{MODULE} import time over {args.runs} runs: "
+          f"min={samples[0]:.1f}ms median={median:.1f}ms max={samples[-1]:.1f}ms "
+          f"(budget {args.budget_ms:.1f}ms)")
+
+    failures = []
+    if median > args.budget_ms:
+        failures.append(f"median import time {median:.1f}ms exceeds budget {args.budget_ms:.1f}ms")
+    if loaded:
+        failures.append(f"heavy modules imported eagerly: {', '.join(loaded)}")
+    if root_handlers:
+        failures.append(f"import installed {root_handlers} root logging handler(s)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
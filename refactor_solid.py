@@ -1,245 +1,3224 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from array import array
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from enum import Enum
+from collections import OrderedDict
+from itertools import compress, islice
+from typing import (
+    TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union,
+)
 import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+# Modul berat (asyncio, sqlite3, concurrent.futures, multiprocessing,
+# argparse, logging.handlers, dll.) diimpor di dalam fungsi yang memakainya,
+# sehingga import modul ini tetap murah untuk worker berumur pendek.
+# Lihat benchmarks/check_import_time.py untuk anggaran waktu import.
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+    import logging.handlers
+    import random
+    import sqlite3
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def _queue_logging_classes() -> Tuple[type, type]:
+    """Membuat kelas QueueHandler dan QueueListener untuk antrian terbatas.
+    
+    Kelas dibuat saat dibutuhkan agar logging.handlers dan queue tidak
+    ikut diimpor ketika modul ini di-import.
+    
+    Returns:
+        Tuple (subkelas QueueHandler dengan atribut block dan dropped,
+        subkelas QueueListener yang stop-nya aman dipanggil berulang)
+    """
+    from logging.handlers import QueueHandler, QueueListener
+    import queue
+    
+    class _BoundedQueueHandler(QueueHandler):
+        """QueueHandler dengan buffer terbatas dan kebijakan saat penuh.
+        
+        Attributes:
+            block: True untuk menunggu slot kosong, False untuk membuang record
+            dropped: Jumlah record yang dibuang karena buffer penuh
+        """
+        
+        def __init__(self, log_queue: queue.Queue, block: bool):
+            super().__init__(log_queue)
+            self.block = block
+            self.dropped = 0
+        
+        def enqueue(self, record: logging.LogRecord) -> None:
+            if self.block:
+                self.queue.put(record)
+                return
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+    
+    class _StoppableQueueListener(QueueListener):
+        """QueueListener yang stop-nya idempotent.
+        
+        stop dapat dipanggil oleh pemanggil dan oleh hook atexit; panggilan
+        kedua diabaikan. Sentinel dimasukkan dengan put yang menunggu,
+        karena put_nowait bawaan dapat gagal dengan queue.Full pada antrian
+        terbatas.
+        """
+        
+        def enqueue_sentinel(self) -> None:
+            self.queue.put(self._sentinel)
+        
+        def stop(self) -> None:
+            if self._thread is None:
+                return
+            super().stop()
+    
+    return _BoundedQueueHandler, _StoppableQueueListener
+
+
+def configure_logging(level: int = logging.INFO, use_queue: bool = False,
+                      queue_size: int = 10_000,
+                      block_when_full: bool = False) -> "Optional[logging.handlers.QueueListener]":
+    """Mengatur konfigurasi logging untuk sistem checkout.
+    
+    Modul ini tidak mengonfigurasi logging saat di-import; fungsi ini
+    dipanggil oleh main() atau oleh aplikasi yang memakai modul ini.
+    Secara default memasang stream handler biasa seperti basicConfig.
+    Dengan use_queue=True, handler root dipindahkan ke QueueListener yang
+    berjalan di thread latar belakang, sehingga thread checkout hanya
+    menaruh record ke antrian dan tidak menunggu I/O stderr.
+    
+    Args:
+        level: Level logging root
+        use_queue: True untuk memakai QueueHandler/QueueListener
+        queue_size: Kapasitas maksimum antrian record log
+        block_when_full: True untuk menunggu ketika antrian penuh, False
+            untuk membuang record (jumlahnya dicatat di handler.dropped)
+            
+    Returns:
+        QueueListener yang sudah berjalan jika use_queue=True, selain itu
+        None. stop() pada listener aman dipanggil walaupun hook atexit
+        juga menghentikannya.
+    """
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+    # basicConfig tidak mengubah apa pun jika root sudah punya handler
+    root = logging.getLogger()
+    root.setLevel(level)
+    if not use_queue:
+        return None
+    
+    import atexit
+    from logging.handlers import QueueHandler
+    import queue
+    
+    handler_class, listener_class = _queue_logging_classes()
+    targets = [
+        handler for handler in root.handlers
+        if not isinstance(handler, QueueHandler)
+    ]
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    listener = listener_class(
+        log_queue, *targets, respect_handler_level=True
+    )
+    root.handlers = [handler_class(log_queue, block_when_full)]
+    listener.start()
+    # Pastikan record yang tersisa di antrian ditulis saat proses selesai
+    atexit.register(listener.stop)
+    return listener
+
+
+logger = logging.getLogger(__name__)
+# Logger terpisah untuk log per pesanan di jalur checkout, agar dapat
+# dimatikan pada run dengan throughput tinggi tanpa menyentuh log lainnya
+order_logger = logging.getLogger(f"{__name__}.orders")
+
+
+def set_order_logging(enabled: bool) -> None:
+    """Mengaktifkan atau menonaktifkan log per pesanan.
+    
+    Ketika dinonaktifkan, banner INFO dan DEBUG per pesanan dari
+    CheckoutService, processor, dan notifier dibuang sebelum pesan
+    diformat. Peringatan dan error tetap dicatat.
+    
+    Args:
+        enabled: False untuk membuang log INFO/DEBUG per pesanan
+    """
+    order_logger.setLevel(logging.NOTSET if enabled else logging.WARNING)
+
+
+class OrderStatus(str, Enum):
+    """Status pesanan yang valid sebagai state machine.
+    
+    Setiap status adalah singleton, sehingga jutaan Order berbagi objek
+    status yang sama. Karena turunan dari str, perbandingan dengan string
+    lama seperti "paid" tetap berlaku. Transisi yang diizinkan ditentukan
+    oleh tabel _TRANSITIONS dan diperiksa dengan can_transition_to.
+    
+    NOTIFIED berarti notifier sudah menerima notifikasi, yaitu send()
+    kembali tanpa error. Untuk notifier yang menunda pengiriman, seperti
+    EmailNotifier dalam mode batch atau OutboxNotifier, ini berarti
+    notifikasi sudah masuk buffer atau outbox, belum tentu terkirim.
+    """
+    OPEN = "open"
+    PAID = "paid"
+    AUTHORIZED = "authorized"
+    NOTIFIED = "notified"
+    FAILED = "failed"
+    REFUNDED = "refunded"
+    
+    def __str__(self) -> str:
+        return self.value
+    
+    def can_transition_to(self, target: "OrderStatus") -> bool:
+        """Memeriksa apakah transisi ke status target diizinkan.
+        
+        Args:
+            target: OrderStatus tujuan
+            
+        Returns:
+            True jika transisi diizinkan
+        """
+        return bool(_TRANSITION_MASKS[_STATUS_CODES[self]] >> _STATUS_CODES[target] & 1)
+
+
+class InvalidTransitionError(ValueError):
+    """Dilempar ketika perubahan status melanggar state machine OrderStatus."""
+    
+    def __init__(self, current: OrderStatus, target: OrderStatus):
+        super().__init__(f"Invalid order status transition: {current} -> {target}")
+        self.current = current
+        self.target = target
+
+
+def check_transition(current: OrderStatus, target: OrderStatus) -> None:
+    """Memastikan transisi status diizinkan.
+    
+    Args:
+        current: OrderStatus saat ini
+        target: OrderStatus tujuan
+        
+    Raises:
+        InvalidTransitionError: Jika transisi tidak diizinkan
+    """
+    if not current.can_transition_to(target):
+        raise InvalidTransitionError(current, target)
+
+
+# Basis poin per 100%, dipakai untuk tarif pajak dan diskon (1100 = 11%)
+BASIS_POINTS = 10_000
+
+
+def _apply_rate(amount: int, rate_bp: int) -> int:
+    """Mengalikan amount dengan tarif basis poin, dibulatkan setengah ke atas."""
+    return (amount * rate_bp + BASIS_POINTS // 2) // BASIS_POINTS
+
+
+class Money(int):
+    """Nilai uang fixed-point dalam satuan terkecil (sen).
+    
+    Turunan int sehingga penjumlahan selalu eksak dan Money dapat dipakai
+    langsung sebagai Order.total_price. Tarif pajak dan diskon dinyatakan
+    dalam basis poin integer agar tidak ada pembulatan float.
+    """
+    
+    __slots__ = ()
+    
+    # Jumlah satuan terkecil per satu unit mata uang
+    SCALE = 100
+    
+    @classmethod
+    def from_major(cls, value: Union[str, int]) -> "Money":
+        """Membuat Money dari nilai dalam satuan utama, misalnya "5000.25".
+        
+        Args:
+            value: String desimal dengan paling banyak dua angka di belakang
+                koma, atau integer dalam satuan utama
+                
+        Returns:
+            Money dalam satuan sen
+            
+        Raises:
+            TypeError: Jika value bukan str atau int, misalnya float atau
+                bool, agar pembulatan float tidak masuk diam-diam
+            ValueError: Jika format tidak valid atau lebih dari dua desimal
+        """
+        if isinstance(value, bool) or not isinstance(value, (str, int)):
+            raise TypeError(
+                f"Money.from_major expects str or int, got {type(value).__name__}"
+            )
+        if isinstance(value, int):
+            return cls(value * cls.SCALE)
+        text = value.strip()
+        # Paling banyak satu tanda di depan, sisanya harus angka
+        negative = text.startswith("-")
+        if text[:1] in ("+", "-"):
+            text = text[1:]
+        whole, _, fraction = text.partition(".")
+        if not (whole or fraction) or len(fraction) > 2 \
+                or not (whole or "0").isdigit() or not (fraction or "0").isdigit():
+            raise ValueError(f"Invalid money amount: {value!r}")
+        cents = int(whole or "0") * cls.SCALE + int(fraction.ljust(2, "0"))
+        return cls(-cents if negative else cents)
+    
+    def __repr__(self) -> str:
+        return f"Money.from_major('{self}')"
+    
+    def __str__(self) -> str:
+        major, minor = divmod(abs(int(self)), self.SCALE)
+        return f"{'-' if self < 0 else ''}{major}.{minor:02d}"
+    
+    def __add__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) + other)
+        return NotImplemented
+    
+    __radd__ = __add__
+    
+    def __sub__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) - other)
+        return NotImplemented
+    
+    def __rsub__(self, other):
+        if isinstance(other, int):
+            return Money(other - int(self))
+        return NotImplemented
+    
+    def __neg__(self) -> "Money":
+        return Money(-int(self))
+    
+    def __mul__(self, other):
+        if isinstance(other, int) and not isinstance(other, Money):
+            return Money(int(self) * other)
+        return NotImplemented
+    
+    __rmul__ = __mul__
+    
+    def tax(self, rate_bp: int) -> "Money":
+        """Menghitung pajak dari nilai ini.
+        
+        Args:
+            rate_bp: Tarif pajak dalam basis poin, misalnya 1100 untuk 11%
+            
+        Returns:
+            Besar pajak, dibulatkan setengah sen ke atas
+        """
+        return Money(_apply_rate(self, rate_bp))
+    
+    def discount(self, rate_bp: int) -> "Money":
+        """Menghitung nilai setelah diskon.
+        
+        Args:
+            rate_bp: Tarif diskon dalam basis poin, misalnya 500 untuk 5%
+            
+        Returns:
+            Nilai setelah dikurangi diskon (diskon dibulatkan setengah
+            sen ke atas)
+        """
+        return Money(self - _apply_rate(self, rate_bp))
+
+
+@dataclass(slots=True)
+class Order:
+    """Data class yang merepresentasikan pesanan pelanggan.
+    
+    Menggunakan __slots__ agar setiap instance tidak membawa __dict__,
+    karena jutaan pesanan dapat tersimpan di memori sekaligus.
+    
+    Attributes:
+        customer_name: Nama pelanggan yang melakukan pesanan
+        total_price: Total harga dari pesanan dalam satuan sen (integer
+            atau Money)
+        status: Status pesanan, default adalah OrderStatus.OPEN
+        order_id: ID pesanan atau token idempotency dari klien, opsional
+        payment_method: Kunci metode pembayaran seperti "card" atau "qris",
+            dipakai oleh RoutingPaymentProcessor
+    """
+    customer_name: str
+    total_price: int
+    status: OrderStatus = OrderStatus.OPEN
+    order_id: Optional[str] = None
+    payment_method: Optional[str] = None
+
+
+# Kode numerik untuk setiap OrderStatus, dipakai oleh kolom status OrderBatch
+# dan record OrderJournal. Kode tersimpan di file journal, jadi anggota baru
+# OrderStatus harus selalu ditambahkan di akhir.
+_STATUS_BY_CODE = tuple(OrderStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUS_BY_CODE)}
+
+# Transisi status yang diizinkan. FAILED dapat dibuka kembali menjadi OPEN
+# agar pesanan yang ditolak bisa dicoba ulang; REFUNDED adalah status akhir.
+_TRANSITIONS = {
+    OrderStatus.OPEN: (OrderStatus.AUTHORIZED, OrderStatus.PAID, OrderStatus.FAILED),
+    OrderStatus.AUTHORIZED: (OrderStatus.PAID, OrderStatus.FAILED),
+    OrderStatus.PAID: (OrderStatus.NOTIFIED, OrderStatus.REFUNDED),
+    OrderStatus.NOTIFIED: (OrderStatus.REFUNDED,),
+    OrderStatus.FAILED: (OrderStatus.OPEN,),
+    OrderStatus.REFUNDED: (),
+}
+# Tabel bitmask yang sudah dihitung: bit ke-k pada _TRANSITION_MASKS[i]
+# menyala jika status berkode i boleh berpindah ke status berkode k
+_TRANSITION_MASKS = tuple(
+    sum(1 << _STATUS_CODES[target] for target in _TRANSITIONS[status])
+    for status in _STATUS_BY_CODE
+)
+
+
+class OrderBatch:
+    """Kumpulan pesanan dalam format kolom (columnar).
+    
+    Setiap atribut Order disimpan sebagai kolom paralel: customer_name
+    dalam list, total_price dalam array integer 64-bit, dan status dalam
+    array kode byte. Kolom array mendukung buffer protocol, sehingga dapat
+    dibaca NumPy tanpa menyalin (numpy.frombuffer) bila diperlukan.
+    
+    Attributes:
+        customer_names: List nama pelanggan
+        total_prices: Array harga dalam satuan sen
+        statuses: Array kode status (indeks ke OrderStatus)
+        order_ids: List ID pesanan (boleh berisi None)
+        payment_methods: List metode pembayaran (boleh berisi None)
+    """
+    
+    __slots__ = ("customer_names", "total_prices", "statuses", "order_ids", "payment_methods")
+    
+    def __init__(self, customer_names: Optional[List[str]] = None,
+                 total_prices: Optional[array] = None,
+                 statuses: Optional[array] = None,
+                 order_ids: Optional[List[Optional[str]]] = None,
+                 payment_methods: Optional[List[Optional[str]]] = None):
+        """Menginisialisasi OrderBatch dari kolom yang sudah ada.
+        
+        Args:
+            customer_names: List nama pelanggan
+            total_prices: Array 'q' berisi harga dalam satuan sen
+            statuses: Array 'B' berisi kode status, default semua OPEN
+            order_ids: List ID pesanan, default semua None
+            payment_methods: List metode pembayaran, default semua None
+        """
+        self.customer_names = customer_names if customer_names is not None else []
+        self.total_prices = total_prices if total_prices is not None else array("q")
+        if statuses is None:
+            statuses = array("B", bytes([_STATUS_CODES[OrderStatus.OPEN]]) * len(self.customer_names))
+        self.statuses = statuses
+        count = len(self.customer_names)
+        self.order_ids = order_ids if order_ids is not None else [None] * count
+        self.payment_methods = payment_methods if payment_methods is not None else [None] * count
+        if not (count == len(self.total_prices) == len(self.statuses)
+                == len(self.order_ids) == len(self.payment_methods)):
+            raise ValueError("OrderBatch columns must have the same length")
+    
+    @classmethod
+    def from_orders(cls, orders: Iterable[Order]) -> "OrderBatch":
+        """Membuat OrderBatch dari kumpulan objek Order.
+        
+        Args:
+            orders: Iterable berisi objek Order
+            
+        Returns:
+            OrderBatch dengan urutan yang sama seperti input
+        """
+        orders = list(orders)
+        codes = _STATUS_CODES
+        return cls(
+            [order.customer_name for order in orders],
+            array("q", [order.total_price for order in orders]),
+            array("B", [codes[order.status] for order in orders]),
+            [order.order_id for order in orders],
+            [order.payment_method for order in orders]
+        )
+    
+    def to_orders(self) -> List[Order]:
+        """Mengubah OrderBatch kembali menjadi list objek Order.
+        
+        Returns:
+            List objek Order baru dengan urutan yang sama seperti batch
+        """
+        by_code = _STATUS_BY_CODE
+        return [
+            Order(name, price, by_code[code], order_id, method)
+            for name, price, code, order_id, method in zip(
+                self.customer_names, self.total_prices, self.statuses,
+                self.order_ids, self.payment_methods
+            )
+        ]
+    
+    def __len__(self) -> int:
+        return len(self.total_prices)
+    
+    def validate(self) -> List[int]:
+        """Mencari baris yang tidak valid.
+        
+        Baris dianggap tidak valid jika nama pelanggan kosong atau harga
+        bernilai negatif.
+        
+        Returns:
+            List indeks baris yang tidak valid
+        """
+        if min(self.total_prices, default=0) >= 0 and all(self.customer_names):
+            return []
+        return [
+            index
+            for index, (name, price) in enumerate(zip(self.customer_names, self.total_prices))
+            if not name or price < 0
+        ]
+    
+    def count(self, status: OrderStatus) -> int:
+        """Menghitung jumlah pesanan dengan status tertentu.
+        
+        Args:
+            status: OrderStatus yang dihitung
+            
+        Returns:
+            Jumlah pesanan dengan status tersebut
+        """
+        return self.statuses.count(_STATUS_CODES[status])
+    
+    def total(self, status: Optional[OrderStatus] = None) -> Money:
+        """Menghitung total harga pesanan secara eksak.
+        
+        Args:
+            status: Jika diisi, hanya pesanan dengan status ini yang dijumlah
+            
+        Returns:
+            Total harga dalam satuan sen
+        """
+        if status is None:
+            return Money(sum(self.total_prices))
+        code = _STATUS_CODES[status]
+        return Money(sum(compress(self.total_prices, [c == code for c in self.statuses])))
+    
+    def tax(self, rate_bp: int) -> array:
+        """Menghitung pajak setiap pesanan sekaligus.
+        
+        Args:
+            rate_bp: Tarif pajak dalam basis poin, misalnya 1100 untuk 11%
+            
+        Returns:
+            Array 'q' berisi pajak per pesanan dalam satuan sen, dengan
+            pembulatan yang sama seperti Money.tax
+        """
+        half = BASIS_POINTS // 2
+        return array("q", [(price * rate_bp + half) // BASIS_POINTS for price in self.total_prices])
+    
+    def total_tax(self, rate_bp: int) -> Money:
+        """Menjumlahkan pajak per pesanan secara eksak.
+        
+        Args:
+            rate_bp: Tarif pajak dalam basis poin
+            
+        Returns:
+            Total pajak dalam satuan sen
+        """
+        return Money(sum(self.tax(rate_bp)))
+    
+    def apply_discount(self, rate_bp: int) -> None:
+        """Mengurangi harga setiap pesanan dengan diskon yang sama.
+        
+        Args:
+            rate_bp: Tarif diskon dalam basis poin, misalnya 500 untuk 5%
+        """
+        half = BASIS_POINTS // 2
+        self.total_prices = array("q", [
+            price - (price * rate_bp + half) // BASIS_POINTS for price in self.total_prices
+        ])
+    
+    def set_status(self, status: OrderStatus, mask: Iterable[bool]) -> None:
+        """Mengubah status untuk semua baris yang ditandai mask.
+        
+        Semua transisi divalidasi terhadap tabel state machine sebelum ada
+        baris yang diubah, sehingga batch tidak pernah berubah sebagian.
+        
+        Args:
+            status: OrderStatus baru
+            mask: Iterable boolean sepanjang batch, misalnya hasil dari
+                CheckoutService.run_checkout_many
+                
+        Raises:
+            InvalidTransitionError: Jika ada baris yang tidak boleh
+                berpindah ke status tersebut
+        """
+        code = _STATUS_CODES[status]
+        statuses = self.statuses
+        indices = list(compress(range(len(statuses)), mask))
+        # Kode asal yang boleh berpindah ke status tujuan
+        allowed = {source for source, bits in enumerate(_TRANSITION_MASKS) if bits >> code & 1}
+        for index in indices:
+            if statuses[index] not in allowed:
+                raise InvalidTransitionError(_STATUS_BY_CODE[statuses[index]], status)
+        for index in indices:
+            statuses[index] = code
+
+
+def _new_order_id() -> str:
+    """Membuat ID pesanan acak 32 karakter heksadesimal.
+
+    Formatnya sama dengan uuid.uuid4().hex tanpa mengimpor modul uuid.
+
+    Returns:
+        String heksadesimal dari 16 byte acak
+    """
+    return os.urandom(16).hex()
+
+
+class IOrderStore(ABC):
+    """Interface untuk penyimpanan pesanan berdasarkan prinsip DIP.
+    
+    CheckoutService memakai interface ini untuk setiap perubahan status,
+    sehingga penyimpanan (indeks memori, database, journal) tetap
+    sinkron dengan status pesanan tanpa CheckoutService mengetahui
+    implementasinya.
+    
+    Methods:
+        add: Menyimpan pesanan baru
+        update_status: Mengubah status pesanan yang tersimpan
+    """
+    
+    @abstractmethod
+    def add(self, order: Order) -> None:
+        """Menyimpan pesanan baru.
+        
+        Args:
+            order: Objek Order yang akan disimpan
+        """
+        pass
+    
+    @abstractmethod
+    def update_status(self, order: Order, status: OrderStatus) -> None:
+        """Mengubah status pesanan dan mencatat perubahannya.
+        
+        Implementasi bertanggung jawab mengisi order.status.
+        
+        Args:
+            order: Objek Order yang statusnya berubah
+            status: OrderStatus baru
+        """
+        pass
+
+
+class _SortedPrices:
+    """Himpunan harga unik terurut yang disimpan dalam blok-blok kecil.
+    
+    Setiap blok adalah list terurut berukuran paling banyak 2 * BLOCK,
+    dan _maxes menyimpan harga terbesar setiap blok. add dan remove
+    mencari blok dengan bisect lalu hanya menggeser isi satu blok,
+    sehingga biayanya tidak tumbuh linear dengan jumlah harga seperti
+    list.insert pada satu list besar.
+    """
+    
+    __slots__ = ("_blocks", "_maxes")
+    
+    BLOCK = 1024
+    
+    def __init__(self, prices: Iterable[int] = ()):
+        """Membangun indeks sekaligus dari harga unik.
+        
+        Args:
+            prices: Harga unik dalam urutan apa pun
+        """
+        values = sorted(prices)
+        size = self.BLOCK
+        self._blocks: List[List[int]] = [
+            values[start:start + size] for start in range(0, len(values), size)
+        ]
+        self._maxes: List[int] = [block[-1] for block in self._blocks]
+    
+    def add(self, price: int) -> None:
+        if not self._blocks:
+            self._blocks.append([price])
+            self._maxes.append(price)
+            return
+        index = min(bisect_left(self._maxes, price), len(self._maxes) - 1)
+        block = self._blocks[index]
+        insort(block, price)
+        self._maxes[index] = block[-1]
+        if len(block) > 2 * self.BLOCK:
+            # Pecah blok yang terlalu besar menjadi dua
+            half = self.BLOCK
+            self._blocks[index:index + 1] = [block[:half], block[half:]]
+            self._maxes[index:index + 1] = [block[half - 1], block[-1]]
+    
+    def remove(self, price: int) -> None:
+        index = bisect_left(self._maxes, price)
+        block = self._blocks[index]
+        del block[bisect_left(block, price)]
+        if block:
+            self._maxes[index] = block[-1]
+        else:
+            del self._blocks[index]
+            del self._maxes[index]
+    
+    def irange(self, low: Optional[int], high: Optional[int]) -> Iterator[int]:
+        """Mengiterasi harga di dalam rentang inklusif secara terurut.
+        
+        Args:
+            low: Batas bawah, atau None
+            high: Batas atas, atau None
+            
+        Yields:
+            Harga terurut naik
+        """
+        first = 0 if low is None else bisect_left(self._maxes, low)
+        for index in range(first, len(self._blocks)):
+            block = self._blocks[index]
+            start = bisect_left(block, low) if low is not None and index == first else 0
+            for price in islice(block, start, None):
+                if high is not None and price > high:
+                    return
+                yield price
+
+
+class OrderRepository(IOrderStore):
+    """Penyimpanan pesanan di memori dengan indeks sekunder.
+    
+    Pesanan diindeks berdasarkan customer_name, status, dan total_price
+    (dictionary), ditambah harga unik terurut untuk pencarian rentang,
+    sehingga pencarian seperti "semua pesanan open milik pelanggan X" atau
+    "pesanan paid di atas N" tidak perlu memindai seluruh pesanan. add dan
+    remove berbiaya O(log n) sehingga jutaan pesanan tetap dapat dikelola.
+    total_price dianggap tidak berubah setelah pesanan disimpan.
+    """
+    
+    def __init__(self, orders: Iterable[Order] = ()):
+        """Menginisialisasi OrderRepository.
+        
+        Args:
+            orders: Pesanan awal yang langsung disimpan
+        """
+        self._lock = threading.RLock()
+        # Semua indeks memakai id(order) sebagai key; objek tetap hidup
+        # selama tersimpan di self._orders sehingga id-nya stabil
+        self._orders: Dict[int, Order] = {}
+        self._by_customer: Dict[str, Dict[int, Order]] = {}
+        self._by_status: Dict[OrderStatus, Dict[int, Order]] = {}
+        self._by_price: Dict[int, Dict[int, Order]] = {}
+        for order in orders:
+            if id(order) not in self._orders:
+                self._index(order)
+        # Pesanan awal diurutkan sekali, bukan disisipkan satu per satu
+        self._prices = _SortedPrices(self._by_price)
+    
+    def __len__(self) -> int:
+        return len(self._orders)
+    
+    def __contains__(self, order: Order) -> bool:
+        return id(order) in self._orders
+    
+    def add(self, order: Order) -> None:
+        """Menyimpan pesanan dan memasukkannya ke semua indeks.
+        
+        Args:
+            order: Objek Order yang akan disimpan
+        """
+        with self._lock:
+            if id(order) in self._orders:
+                return
+            if self._index(order):
+                self._prices.add(order.total_price)
+    
+    def remove(self, order: Order) -> None:
+        """Menghapus pesanan dari repository dan semua indeks.
+        
+        Args:
+            order: Objek Order yang akan dihapus
+            
+        Raises:
+            KeyError: Jika pesanan tidak tersimpan di repository
+        """
+        key = id(order)
+        with self._lock:
+            del self._orders[key]
+            self._discard(self._by_customer, order.customer_name, key)
+            self._discard(self._by_status, order.status, key)
+            self._discard(self._by_price, order.total_price, key)
+            if order.total_price not in self._by_price:
+                self._prices.remove(order.total_price)
+    
+    def update_status(self, order: Order, status: OrderStatus) -> None:
+        """Mengubah status pesanan dan memindahkannya di indeks status.
+        
+        Args:
+            order: Objek Order yang statusnya berubah
+            status: OrderStatus baru
+        """
+        key = id(order)
+        with self._lock:
+            if key in self._orders:
+                self._discard(self._by_status, order.status, key)
+                self._by_status.setdefault(status, {})[key] = order
+            order.status = status
+    
+    def by_customer(self, customer_name: str,
+                    status: Optional[OrderStatus] = None) -> List[Order]:
+        """Mencari pesanan milik seorang pelanggan.
+        
+        Args:
+            customer_name: Nama pelanggan
+            status: Jika diisi, hanya pesanan dengan status ini
+            
+        Returns:
+            List pesanan
+        """
+        with self._lock:
+            orders = self._by_customer.get(customer_name, {})
+            if status is None:
+                return list(orders.values())
+            return self._intersect(orders, self._by_status.get(status, {}))
+    
+    def by_status(self, status: OrderStatus) -> List[Order]:
+        """Mencari semua pesanan dengan status tertentu.
+        
+        Args:
+            status: OrderStatus yang dicari
+            
+        Returns:
+            List pesanan
+        """
+        with self._lock:
+            return list(self._by_status.get(status, {}).values())
+    
+    def price_range(self, min_price: Optional[int] = None,
+                    max_price: Optional[int] = None,
+                    status: Optional[OrderStatus] = None) -> List[Order]:
+        """Mencari pesanan dengan total_price di dalam rentang.
+        
+        Args:
+            min_price: Batas bawah inklusif dalam sen, atau None
+            max_price: Batas atas inklusif dalam sen, atau None
+            status: Jika diisi, hanya pesanan dengan status ini
+            
+        Returns:
+            List pesanan terurut berdasarkan total_price
+        """
+        with self._lock:
+            by_price = self._by_price
+            buckets = [by_price[price] for price in self._prices.irange(min_price, max_price)]
+            if status is None:
+                return [order for bucket in buckets for order in bucket.values()]
+            matching = self._by_status.get(status, {})
+            if len(matching) < sum(map(len, buckets)):
+                # Indeks status lebih kecil: filter dari sisi status lalu urutkan
+                return sorted(
+                    (order for order in matching.values()
+                     if (min_price is None or order.total_price >= min_price)
+                     and (max_price is None or order.total_price <= max_price)),
+                    key=lambda order: order.total_price
+                )
+            return [
+                order for bucket in buckets
+                for key, order in bucket.items() if key in matching
+            ]
+    
+    def _index(self, order: Order) -> bool:
+        # Dipanggil dengan self._lock sudah dipegang (atau dari __init__);
+        # mengembalikan True jika total_price belum ada di indeks harga
+        key = id(order)
+        self._orders[key] = order
+        self._by_customer.setdefault(order.customer_name, {})[key] = order
+        self._by_status.setdefault(order.status, {})[key] = order
+        bucket = self._by_price.get(order.total_price)
+        if bucket is None:
+            self._by_price[order.total_price] = {key: order}
+            return True
+        bucket[key] = order
+        return False
+    
+    @staticmethod
+    def _intersect(left: Dict[int, Order], right: Dict[int, Order]) -> List[Order]:
+        if len(right) < len(left):
+            return [order for key, order in right.items() if key in left]
+        return [order for key, order in left.items() if key in right]
+    
+    @staticmethod
+    def _discard(index: Dict, value, key: int) -> None:
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del index[value]
+
+
+class SQLiteOrderStore(IOrderStore):
+    """Penyimpanan pesanan persisten berbasis SQLite (mode WAL).
+    
+    add dan update_status hanya menaruh perubahan ke buffer di memori.
+    Thread latar belakang menulis buffer ke database dalam satu transaksi
+    menggunakan executemany setiap flush_interval detik atau ketika buffer
+    mencapai batch_size, sehingga run_checkout tidak menunggu fsync untuk
+    setiap pesanan. Perubahan yang belum di-flush hilang jika proses
+    berhenti mendadak. Pesanan tanpa order_id diberi ID baru saat disimpan.
+    Setiap perubahan ditulis sebagai baris lengkap dengan upsert, sehingga
+    pesanan yang sudah membawa order_id (misalnya token idempotensi klien
+    atau hasil ingest) tetap tersimpan walaupun tidak pernah di-add.
+    
+    Attributes:
+        path: Lokasi file database SQLite
+        batch_size: Jumlah perubahan yang memicu flush lebih awal
+        flush_interval: Interval flush latar belakang dalam detik
+    """
+    
+    def __init__(self, path: str, batch_size: int = 1000,
+                 flush_interval: float = 0.5):
+        """Menginisialisasi SQLiteOrderStore dan menjalankan thread flush.
+        
+        Args:
+            path: Lokasi file database SQLite
+            batch_size: Jumlah perubahan yang memicu flush lebih awal
+            flush_interval: Interval flush latar belakang dalam detik
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        import sqlite3
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS orders ("
+            " order_id TEXT PRIMARY KEY,"
+            " customer_name TEXT NOT NULL,"
+            " total_price INTEGER NOT NULL,"
+            " status TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending: List[tuple] = []
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._run, name="order-store-flusher", daemon=True
+        )
+        self._flusher.start()
+    
+    def add(self, order: Order) -> None:
+        """Menaruh pesanan baru ke buffer untuk ditulis ke database.
+        
+        Args:
+            order: Objek Order yang akan disimpan
+        """
+        if order.order_id is None:
+            order.order_id = _new_order_id()
+        row = (order.order_id, order.customer_name, order.total_price, str(order.status))
+        with self._buffer_lock:
+            self._pending.append(row)
+            pending = len(self._pending)
+        if pending >= self.batch_size:
+            self._wakeup.set()
+    
+    def update_status(self, order: Order, status: OrderStatus) -> None:
+        """Mengubah status pesanan dan menaruh perubahannya ke buffer.
+        
+        Baris lengkap pesanan ikut ditulis, sehingga pesanan yang belum
+        pernah disimpan akan tersimpan saat flush.
+        
+        Args:
+            order: Objek Order yang statusnya berubah
+            status: OrderStatus baru
+        """
+        order.status = status
+        self.add(order)
+    
+    def flush(self) -> None:
+        """Menulis semua perubahan di buffer ke database sekarang juga.
+        
+        Jika penulisan gagal, perubahan tetap di buffer untuk flush
+        berikutnya.
+        
+        Raises:
+            sqlite3.Error: Jika database gagal ditulis (misalnya terkunci)
+        """
+        with self._write_lock:
+            with self._buffer_lock:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return
+            import sqlite3
+            
+            try:
+                with self._conn:
+                    # Urutan buffer dipertahankan, sehingga perubahan terakhir
+                    # untuk order_id yang sama yang tersimpan; upsert menjaga
+                    # rowid sehingga urutan load() tetap urutan penyimpanan awal
+                    self._conn.executemany(
+                        "INSERT INTO orders (order_id, customer_name, total_price, status)"
+                        " VALUES (?, ?, ?, ?)"
+                        " ON CONFLICT(order_id) DO UPDATE SET"
+                        " customer_name = excluded.customer_name,"
+                        " total_price = excluded.total_price,"
+                        " status = excluded.status",
+                        rows
+                    )
+            except sqlite3.Error:
+                # Transaksi di-rollback; kembalikan baris ke depan buffer
+                # agar dicoba lagi pada flush berikutnya
+                with self._buffer_lock:
+                    self._pending[:0] = rows
+                raise
+    
+    def load(self, status: Optional[OrderStatus] = None) -> List[Order]:
+        """Membaca pesanan yang tersimpan, misalnya setelah restart.
+        
+        Args:
+            status: Jika diisi, hanya pesanan dengan status ini
+            
+        Returns:
+            List objek Order baru sesuai urutan penyimpanan
+        """
+        self.flush()
+        query = "SELECT order_id, customer_name, total_price, status FROM orders"
+        params: tuple = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (str(status),)
+        with self._write_lock:
+            rows = self._conn.execute(query + " ORDER BY rowid", params).fetchall()
+        return [
+            Order(name, price, OrderStatus(state), order_id)
+            for order_id, name, price, state in rows
+        ]
+    
+    def close(self) -> None:
+        """Menghentikan thread flush, menulis sisa buffer, dan menutup database."""
+        self._stopped.set()
+        self._wakeup.set()
+        self._flusher.join()
+        self.flush()
+        with self._write_lock:
+            self._conn.close()
+    
+    def _run(self) -> None:
+        import sqlite3
+        
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error("Order store flush failed: %s", e)
+
+
+class OrderJournal(IOrderStore):
+    """Journal biner append-only untuk pembuatan pesanan dan perubahan status.
+    
+    Setiap kejadian ditulis sebagai record berukuran tetap (RECORD), sehingga
+    journal dapat dibaca ulang melalui mmap tanpa menyalin isi file dan
+    tanpa parsing teks. Digunakan untuk pemulihan setelah crash dan replay
+    cepat. customer_name disimpan maksimal 64 byte UTF-8 (dipotong jika
+    lebih panjang) dan order_id maksimal 64 byte (ditolak jika lebih
+    panjang, agar ID berbeda tidak bertabrakan); pesanan tanpa order_id
+    diberi ID baru saat disimpan. Pesanan yang order_id-nya belum ada di
+    journal dicatat sebagai CREATED pada perubahan status pertamanya.
+    
+    Attributes:
+        path: Lokasi file journal
+        sync: True untuk fsync setiap flush
+    """
+    
+    # kind, status, padding, total_price, timestamp, order_id, customer_name
+    RECORD = struct.Struct("<BB6xqd64s64s")
+    ORDER_ID_SIZE = 64
+    CREATED = 1
+    STATUS_CHANGED = 2
+    
+    def __init__(self, path: str, sync: bool = False):
+        """Membuka journal untuk ditambahkan.
+        
+        Args:
+            path: Lokasi file journal, dibuat jika belum ada
+            sync: True untuk fsync setiap flush
+        """
+        self.path = path
+        self.sync = sync
+        self._lock = threading.Lock()
+        # order_id yang sudah punya record CREATED di journal ini
+        self._known = set()
+        if os.path.exists(path):
+            self._known.update(
+                record[4] for record in self.iter_records(path) if record[0] == self.CREATED
+            )
+        self._file = open(path, "ab")
+    
+    def add(self, order: Order) -> None:
+        """Mencatat pembuatan pesanan.
+        
+        Args:
+            order: Objek Order yang akan dicatat
+            
+        Raises:
+            ValueError: Jika order_id lebih dari ORDER_ID_SIZE byte
+        """
+        if order.order_id is None:
+            order.order_id = _new_order_id()
+        self._append(self.CREATED, order)
+    
+    def update_status(self, order: Order, status: OrderStatus) -> None:
+        """Mengubah status pesanan dan mencatat perubahannya.
+        
+        Pesanan yang belum pernah dicatat, termasuk yang sudah membawa
+        order_id, dicatat sebagai CREATED dengan status barunya.
+        
+        Args:
+            order: Objek Order yang statusnya berubah
+            status: OrderStatus baru
+            
+        Raises:
+            ValueError: Jika order_id lebih dari ORDER_ID_SIZE byte
+        """
+        order.status = status
+        if order.order_id is None:
+            self.add(order)
+            return
+        self._append(self.STATUS_CHANGED, order)
+    
+    def flush(self) -> None:
+        """Menulis buffer journal ke file (dan fsync jika sync=True)."""
+        with self._lock:
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+    
+    def close(self) -> None:
+        """Menulis sisa buffer dan menutup file journal."""
+        self.flush()
+        with self._lock:
+            self._file.close()
+    
+    def _append(self, kind: int, order: Order) -> None:
+        order_id = order.order_id.encode()
+        if len(order_id) > self.ORDER_ID_SIZE:
+            raise ValueError(
+                f"order_id longer than {self.ORDER_ID_SIZE} bytes: {order.order_id!r}"
+            )
+        with self._lock:
+            if order.order_id not in self._known:
+                kind = self.CREATED
+                self._known.add(order.order_id)
+            name = b"" if kind == self.STATUS_CHANGED else order.customer_name.encode()[:64]
+            record = self.RECORD.pack(
+                kind, _STATUS_CODES[order.status], order.total_price, time.time(),
+                order_id, name
+            )
+            self._file.write(record)
+    
+    @classmethod
+    def iter_records(cls, path: str) -> Iterator[tuple]:
+        """Membaca record journal melalui mmap tanpa menyalin isi file.
+        
+        Record terakhir yang terpotong (misalnya akibat crash saat menulis)
+        diabaikan.
+        
+        Args:
+            path: Lokasi file journal
+            
+        Yields:
+            Tuple (kind, status, total_price, timestamp, order_id, customer_name)
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            usable = size - size % cls.RECORD.size
+            if usable == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    by_code = _STATUS_BY_CODE
+                    for kind, code, price, timestamp, order_id, name in \
+                            cls.RECORD.iter_unpack(view[:usable]):
+                        yield (
+                            kind, by_code[code], price, timestamp,
+                            order_id.rstrip(b"\0").decode(),
+                            name.rstrip(b"\0").decode(errors="ignore")
+                        )
+                finally:
+                    view.release()
+    
+    @classmethod
+    def replay(cls, path: str) -> Dict[str, Order]:
+        """Membangun ulang status terakhir setiap pesanan dari journal.
+        
+        Args:
+            path: Lokasi file journal
+            
+        Returns:
+            Dictionary order_id ke Order dengan status terakhir
+        """
+        orders: Dict[str, Order] = {}
+        for kind, status, price, _, order_id, name in cls.iter_records(path):
+            if kind == cls.CREATED:
+                orders[order_id] = Order(name, price, status, order_id)
+            else:
+                order = orders.get(order_id)
+                if order is not None:
+                    order.status = status
+        return orders
+
+
+class IPaymentProcessor(ABC):
+    """Interface untuk processor pembayaran berdasarkan prinsip DIP.
+    
+    Interface ini mendefinisikan kontrak yang harus diimplementasikan
+    oleh semua jenis processor pembayaran berdasarkan prinsip Open-Closed.
+    
+    Methods:
+        process: Memproses pembayaran untuk pesanan tertentu
+    """
+    
+    @abstractmethod
+    def process(self, order: Order) -> bool:
+        """Memproses pembayaran untuk pesanan.
+        
+        Args:
+            order: Objek Order yang akan diproses pembayarannya
+            
+        Returns:
+            True jika pembayaran berhasil, False jika gagal
+            
+        Raises:
+            Exception: Jika terjadi kesalahan dalam proses pembayaran
+        """
+        pass
+    
+    async def process_async(self, order: Order) -> bool:
+        """Versi asynchronous dari process.
+        
+        Implementasi default menjalankan process di executor bawaan event
+        loop, sehingga processor synchronous seperti CreditCardProcessor
+        tidak memblokir event loop. Processor dengan client async native
+        dapat meng-override metode ini.
+        
+        Args:
+            order: Objek Order yang akan diproses pembayarannya
+            
+        Returns:
+            True jika pembayaran berhasil, False jika gagal
+        """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.process, order)
+    
+    def name_for(self, order: Order) -> str:
+        """Nama processor yang menangani pesanan, untuk CheckoutResult.
+        
+        Decorator dan router meng-override metode ini agar yang dilaporkan
+        adalah processor asli yang benar-benar memproses pesanan.
+        
+        Args:
+            order: Objek Order yang akan diproses
+            
+        Returns:
+            Nama kelas processor
+        """
+        return type(self).__name__
+
+
+class INotificationService(ABC):
+    """Interface untuk layanan notifikasi berdasarkan prinsip DIP.
+    
+    Interface ini mendefinisikan kontrak yang harus diimplementasikan
+    oleh semua jenis layanan notifikasi berdasarkan prinsip Open-Closed.
+    
+    Methods:
+        send: Mengirim notifikasi kepada pelanggan
+        send_many: Mengirim notifikasi untuk banyak pesanan sekaligus
+    """
+    
+    @abstractmethod
+    def send(self, order: Order) -> None:
+        """Mengirim notifikasi kepada pelanggan.
+        
+        Args:
+            order: Objek Order yang menjadi konteks notifikasi
+        """
+        pass
+    
+    async def send_async(self, order: Order) -> None:
+        """Versi asynchronous dari send.
+        
+        Implementasi default menjalankan send di executor bawaan event
+        loop. Notifier dengan client async native dapat meng-override
+        metode ini.
+        
+        Args:
+            order: Objek Order yang menjadi konteks notifikasi
+        """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.send, order)
+    
+    def send_many(self, orders: Iterable[Order]) -> None:
+        """Mengirim notifikasi untuk banyak pesanan.
+        
+        Implementasi default memanggil send untuk setiap pesanan. Notifier
+        yang mendukung pengiriman massal dapat meng-override metode ini
+        agar semua notifikasi dikirim dalam satu round trip.
+        
+        Args:
+            orders: Iterable berisi objek Order yang menjadi konteks notifikasi
+        """
+        for order in orders:
+            self.send(order)
+
+
+class CreditCardProcessor(IPaymentProcessor):
+    """Implementasi processor pembayaran menggunakan kartu kredit.
+    
+    Kelas ini menangani logika spesifik untuk pembayaran kartu kredit
+    dan menunjukkan penerapan prinsip Single Responsibility.
+    """
+    
+    def process(self, order: Order) -> bool:
+        """Memproses pembayaran dengan kartu kredit.
+        
+        Args:
+            order: Objek Order yang akan diproses
+            
+        Returns:
+            True jika pembayaran kartu kredit berhasil
+        """
+        order_logger.info("Processing credit card payment for order: %s", order.customer_name)
+        try:
+            # Simulasi logika pembayaran kartu kredit
+            order_logger.debug("Amount to charge: %d cents", order.total_price)
+            order_logger.info("Credit card payment processed successfully")
+            return True
+        except Exception as e:
+            logger.error("Credit card payment failed: %s", e)
+            return False
+
+
+class EmailNotifier(INotificationService):
+    """Implementasi layanan notifikasi melalui email.
+    
+    Kelas ini menangani pengiriman notifikasi melalui email
+    dan menunjukkan penerapan prinsip Single Responsibility.
+    
+    Secara default setiap send langsung mengirim satu email. Dengan
+    batch_size lebih dari 1 atau flush_interval, notifikasi dikumpulkan
+    lalu dikirim dalam satu round trip ketika jumlahnya mencapai
+    batch_size atau ketika flush_interval detik berlalu sejak notifikasi
+    pertama di buffer. Pada mode batch, error pengiriman muncul pada
+    pemanggilan yang memicu flush, bukan pada send pesanan tersebut.
+    
+    Attributes:
+        batch_size: Jumlah notifikasi maksimum per pengiriman
+        flush_interval: Batas waktu tunggu buffer dalam detik, atau None
+    """
+    
+    def __init__(self, batch_size: int = 1, flush_interval: Optional[float] = None):
+        """Menginisialisasi EmailNotifier.
+        
+        Args:
+            batch_size: Jumlah notifikasi maksimum per pengiriman
+            flush_interval: Batas waktu tunggu buffer dalam detik, atau
+                None untuk flush hanya berdasarkan ukuran
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Order] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+    
+    def send(self, order: Order) -> None:
+        """Mengirim notifikasi email konfirmasi.
+        
+        Pada mode batch, notifikasi hanya ditambahkan ke buffer dan
+        dikirim ketika buffer di-flush.
+        
+        Args:
+            order: Objek Order yang akan dikirim notifikasinya
+        """
+        if self.batch_size == 1 and self.flush_interval is None:
+            self._deliver([order])
+            return
+        
+        with self._lock:
+            self._pending.append(order)
+            if len(self._pending) < self.batch_size:
+                if self.flush_interval is not None and self._timer is None:
+                    self._timer = threading.Timer(self.flush_interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            batch = self._take_pending()
+        self._deliver(batch)
+    
+    def send_many(self, orders: Iterable[Order]) -> None:
+        """Mengirim notifikasi email untuk banyak pesanan sekaligus.
+        
+        Args:
+            orders: Iterable berisi objek Order yang akan dikirim notifikasinya
+        """
+        batch = list(orders)
+        for start in range(0, len(batch), self.batch_size):
+            self._deliver(batch[start:start + self.batch_size])
+    
+    def flush(self) -> None:
+        """Mengirim semua notifikasi yang masih ada di buffer."""
+        with self._lock:
+            batch = self._take_pending()
+        if batch:
+            self._deliver(batch)
+    
+    def close(self) -> None:
+        """Mengirim sisa buffer dan menghentikan timer flush."""
+        self.flush()
+    
+    def _take_pending(self) -> List[Order]:
+        # Dipanggil dengan self._lock sudah dipegang
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+    
+    def _deliver(self, orders: List[Order]) -> None:
+        """Mengirim email untuk sekumpulan pesanan dalam satu round trip."""
+        if len(orders) == 1:
+            order_logger.info("Sending confirmation email to: %s", orders[0].customer_name)
+        else:
+            order_logger.info("Sending %s confirmation emails in one batch", len(orders))
+        # Simulasi pengiriman email
+        if order_logger.isEnabledFor(logging.DEBUG):
+            for order in orders:
+                order_logger.debug("Email content: Order #%s confirmed", order.customer_name)
+        order_logger.info("Email notification sent successfully")
+
+
+class OutboxNotifier(INotificationService):
+    """Notifier yang menulis notifikasi ke outbox lokal berbasis SQLite.
+    
+    send hanya menyimpan notifikasi ke tabel outbox lalu langsung kembali,
+    sehingga latensi notifikasi tidak menambah latensi checkout dan
+    kegagalan pengiriman tidak mengubah pembayaran yang berhasil menjadi
+    gagal. Thread dispatcher di latar belakang membaca outbox dan
+    meneruskannya ke notifier asli melalui send_many. Baris outbox baru
+    dihapus setelah terkirim, sehingga pengiriman bersifat at-least-once.
+    
+    Attributes:
+        notifier: INotificationService asli yang menerima notifikasi
+        batch_size: Jumlah notifikasi maksimum per dispatch
+    """
+    
+    def __init__(self, notifier: INotificationService, path: str,
+                 poll_interval: float = 0.5, batch_size: int = 100):
+        """Menginisialisasi OutboxNotifier dan menjalankan dispatcher.
+        
+        Args:
+            notifier: INotificationService asli yang menerima notifikasi
+            path: Lokasi file SQLite outbox. Wajib diisi karena outbox di
+                memori kehilangan notifikasi yang belum terkirim ketika
+                proses crash atau restart
+            poll_interval: Interval dispatcher memeriksa outbox dalam detik
+            batch_size: Jumlah notifikasi maksimum per dispatch
+        """
+        self.notifier = notifier
+        self.batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._lock = threading.Lock()
+        import sqlite3
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS notification_outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " customer_name TEXT NOT NULL,"
+            " total_price INTEGER NOT NULL,"
+            " status TEXT NOT NULL,"
+            " order_id TEXT)"
+        )
+        self._conn.commit()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._dispatcher = threading.Thread(
+            target=self._run, name="outbox-dispatcher", daemon=True
+        )
+        self._dispatcher.start()
+    
+    def send(self, order: Order) -> None:
+        """Menyimpan notifikasi ke outbox.
+        
+        Args:
+            order: Objek Order yang akan dikirim notifikasinya
+        """
+        self.send_many((order,))
+    
+    def send_many(self, orders: Iterable[Order]) -> None:
+        """Menyimpan notifikasi untuk banyak pesanan ke outbox dalam satu transaksi.
+        
+        Args:
+            orders: Iterable berisi objek Order yang akan dikirim notifikasinya
+        """
+        rows = [
+            (order.customer_name, order.total_price, str(order.status), order.order_id)
+            for order in orders
+        ]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO notification_outbox (customer_name, total_price, status, order_id)"
+                    " VALUES (?, ?, ?, ?)",
+                    rows
+                )
+        self._wakeup.set()
+    
+    def dispatch_pending(self) -> int:
+        """Mengirim satu batch notifikasi dari outbox ke notifier asli.
+        
+        Returns:
+            Jumlah notifikasi yang berhasil dikirim, 0 jika outbox kosong
+            atau pengiriman gagal (baris tetap di outbox untuk dicoba lagi)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, customer_name, total_price, status, order_id FROM notification_outbox"
+                " ORDER BY id LIMIT ?",
+                (self.batch_size,)
+            ).fetchall()
+        if not rows:
+            return 0
+        
+        try:
+            self.notifier.send_many(
+                Order(name, price, OrderStatus(status), order_id)
+                for _, name, price, status, order_id in rows
+            )
+        except Exception as e:
+            logger.error("Outbox dispatch failed, will retry: %s", e)
+            return 0
+        
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM notification_outbox WHERE id <= ?", (rows[-1][0],)
+                )
+        return len(rows)
+    
+    def pending_count(self) -> int:
+        """Menghitung jumlah notifikasi yang belum terkirim.
+        
+        Returns:
+            Jumlah baris di outbox
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM notification_outbox").fetchone()[0]
+    
+    def close(self) -> None:
+        """Menghentikan dispatcher setelah mencoba mengirim sisa outbox."""
+        self._stopped.set()
+        self._wakeup.set()
+        self._dispatcher.join()
+        while self.dispatch_pending():
+            pass
+        with self._lock:
+            self._conn.close()
+    
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._poll_interval)
+            self._wakeup.clear()
+            while not self._stopped.is_set() and self.dispatch_pending():
+                pass
+
+
+class IMetricsSink(ABC):
+    """Interface untuk penampung metrik durasi tahap checkout.
+    
+    Methods:
+        record: Mencatat durasi satu tahap checkout
+    """
+    
+    @abstractmethod
+    def record(self, stage: str, seconds: float) -> None:
+        """Mencatat durasi satu tahap checkout.
+        
+        Args:
+            stage: Nama tahap, yaitu "payment", "status_update", atau
+                "notification"
+            seconds: Durasi wall-clock dalam detik
+        """
+        pass
+
+
+class CallbackMetrics(IMetricsSink):
+    """Metrics sink yang meneruskan setiap pengukuran ke sebuah callback."""
+    
+    def __init__(self, callback: Callable[[str, float], None]):
+        """Menginisialisasi CallbackMetrics.
+        
+        Args:
+            callback: Callable yang menerima (stage, seconds)
+        """
+        self.callback = callback
+    
+    def record(self, stage: str, seconds: float) -> None:
+        self.callback(stage, seconds)
+
+
+class HistogramMetrics(IMetricsSink):
+    """Metrics sink berupa histogram di memori per tahap checkout.
+    
+    Attributes:
+        buckets: Batas atas bucket dalam detik, terurut naik
+    """
+    
+    DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                       0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Menginisialisasi HistogramMetrics.
+        
+        Args:
+            buckets: Batas atas bucket dalam detik, terurut naik
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # stage -> [jumlah per bucket (+Inf di akhir), total detik, jumlah sampel]
+        self._stages: Dict[str, list] = {}
+    
+    def record(self, stage: str, seconds: float) -> None:
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            data = self._stages.get(stage)
+            if data is None:
+                data = self._stages[stage] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            data[0][index] += 1
+            data[1] += seconds
+            data[2] += 1
+    
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Mengambil salinan isi histogram.
+        
+        Returns:
+            Dictionary per tahap berisi "buckets" (jumlah per bucket,
+            non-kumulatif, dengan bucket +Inf di akhir), "sum", dan "count"
+        """
+        with self._lock:
+            return {
+                stage: {"buckets": list(counts), "sum": total, "count": count}
+                for stage, (counts, total, count) in self._stages.items()
+            }
+
+
+class PrometheusTextExporter(HistogramMetrics):
+    """Histogram yang dapat diekspor dalam format teks Prometheus.
+    
+    Attributes:
+        metric_name: Nama metrik histogram Prometheus
+    """
+    
+    def __init__(self, metric_name: str = "checkout_stage_duration_seconds",
+                 buckets: Sequence[float] = HistogramMetrics.DEFAULT_BUCKETS):
+        """Menginisialisasi PrometheusTextExporter.
+        
+        Args:
+            metric_name: Nama metrik histogram Prometheus
+            buckets: Batas atas bucket dalam detik, terurut naik
+        """
+        super().__init__(buckets)
+        self.metric_name = metric_name
+    
+    def render(self) -> str:
+        """Menghasilkan teks exposition format Prometheus.
+        
+        Returns:
+            Teks metrik yang siap disajikan di endpoint /metrics atau
+            ditulis ke textfile collector
+        """
+        name = self.metric_name
+        lines = [
+            f"# HELP {name} Wall time of each checkout stage.",
+            f"# TYPE {name} histogram",
+        ]
+        bounds = [repr(bound) for bound in self.buckets] + ["+Inf"]
+        for stage, data in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, data["buckets"]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {data["sum"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {data["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+@dataclass(slots=True)
+class CheckoutResult:
+    """Hasil checkout yang lebih rinci daripada bool.
+    
+    Nilai boolean CheckoutResult sama dengan success, sehingga dapat
+    dipakai di tempat yang sebelumnya menerima hasil bool.
+    
+    Attributes:
+        success: True jika checkout berhasil
+        processor: Nama kelas payment processor yang menangani pesanan,
+            menurut IPaymentProcessor.name_for
+        failure_stage: Tahap yang gagal ("payment", "status_update",
+            atau "notification"), None jika berhasil
+        error: Pesan exception jika kegagalan disebabkan exception
+        timings: Durasi tiap tahap yang sudah dijalankan dalam detik
+    """
+    success: bool
+    processor: str
+    failure_stage: Optional[str] = None
+    error: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    
+    def __bool__(self) -> bool:
+        return self.success
+
+
+class CheckoutService:
+    """Service untuk mengkoordinasi proses checkout berdasarkan prinsip SRP.
+    
+    Kelas ini bertanggung jawab tunggal untuk mengkoordinasi proses checkout,
+    termasuk pembayaran dan notifikasi berdasarkan prinsip Dependency Injection.
+    
+    Attributes:
+        payment_processor: Processor pembayaran yang diinject
+        notifier: Layanan notifikasi yang diinject
+        metrics: Metrics sink untuk durasi tiap tahap checkout, atau None
+        order_store: Penyimpanan pesanan yang menerima perubahan status, atau None
+    """
+    
+    def __init__(self, payment_processor: IPaymentProcessor, 
+                 notifier: INotificationService,
+                 metrics: Optional[IMetricsSink] = None,
+                 order_store: Optional[IOrderStore] = None):
+        """Menginisialisasi CheckoutService dengan dependency injection.
+        
+        Args:
+            payment_processor: Implementasi IPaymentProcessor untuk pembayaran
+            notifier: Implementasi INotificationService untuk notifikasi
+            metrics: Implementasi IMetricsSink untuk mencatat durasi tahap
+                payment, status_update, dan notification; None berarti
+                tidak ada pengukuran sama sekali
+            order_store: Implementasi IOrderStore yang menerima setiap
+                perubahan status, misalnya OrderRepository
+        """
+        self.payment_processor = payment_processor
+        self.notifier = notifier
+        self.metrics = metrics
+        self.order_store = order_store
+        logger.debug("CheckoutService initialized with %s", type(payment_processor).__name__)
+    
+    def run_checkout(self, order: Order,
+                     detailed: bool = False) -> Union[bool, CheckoutResult]:
+        """Menjalankan proses checkout lengkap.
+        
+        Metode ini mengkoordinasi proses pembayaran dan pengiriman notifikasi.
+        
+        Args:
+            order: Objek Order yang akan diproses checkout
+            detailed: True untuk mengembalikan CheckoutResult berisi tahap
+                yang gagal, nama processor, dan durasi tiap tahap
+            
+        Returns:
+            True jika checkout berhasil, False jika gagal; atau
+            CheckoutResult jika detailed=True
+        """
+        if detailed or self.metrics is not None:
+            result = self._run_checkout_timed(order)
+            return result if detailed else result.success
+        
+        order_logger.info("=== Starting checkout for customer: %s ===", order.customer_name)
+        if order_logger.isEnabledFor(logging.DEBUG):
+            order_logger.debug("Order details: Amount %d cents, Status: %s", order.total_price, order.status)
+        
+        try:
+            # Tolak pesanan yang tidak boleh dibayar sebelum processor dipanggil
+            check_transition(order.status, OrderStatus.PAID)
+            
+            # Process payment
+            order_logger.info("Processing payment...")
+            payment_success = self.payment_processor.process(order)
+            
+            if payment_success:
+                self._set_status(order, OrderStatus.PAID)
+                order_logger.info("Payment successful. Order status updated to: %s", order.status)
+                
+                # Send notification
+                order_logger.info("Sending notification...")
+                self.notifier.send(order)
+                self._set_status(order, OrderStatus.NOTIFIED)
+                
+                order_logger.info("Checkout completed successfully for %s", order.customer_name)
+                return True
+            else:
+                self._set_status(order, OrderStatus.FAILED)
+                logger.warning("Payment failed for customer: %s", order.customer_name)
+                return False
+                
+        except Exception as e:
+            logger.error("Checkout process failed: %s", e)
+            return False
+    
+    def _run_checkout_timed(self, order: Order) -> CheckoutResult:
+        """Versi run_checkout yang mengukur durasi setiap tahap.
+        
+        Dipisah dari run_checkout agar jalur tanpa metrics dan tanpa
+        detailed tidak membayar biaya pemanggilan clock sama sekali.
+        Durasi dicatat ke self.metrics jika ada.
+        """
+        order_logger.info("=== Starting checkout for customer: %s ===", order.customer_name)
+        result = CheckoutResult(False, self.payment_processor.name_for(order))
+        timings = result.timings
+        clock = time.perf_counter
+        stage = "payment"
+        started = clock()
+        try:
+            check_transition(order.status, OrderStatus.PAID)
+            payment_success = self.payment_processor.process(order)
+            now = clock()
+            timings[stage] = now - started
+            
+            if payment_success:
+                stage, started = "status_update", now
+                self._set_status(order, OrderStatus.PAID)
+                now = clock()
+                timings[stage] = now - started
+                order_logger.info("Payment successful. Order status updated to: %s", order.status)
+                
+                stage, started = "notification", now
+                self.notifier.send(order)
+                self._set_status(order, OrderStatus.NOTIFIED)
+                timings[stage] = clock() - started
+                
+                order_logger.info("Checkout completed successfully for %s", order.customer_name)
+                result.success = True
+            else:
+                self._set_status(order, OrderStatus.FAILED)
+                logger.warning("Payment failed for customer: %s", order.customer_name)
+                result.failure_stage = stage
+                
+        except Exception as e:
+            # Tahap yang gagal tetap dicatat durasinya
+            timings[stage] = clock() - started
+            logger.error("Checkout process failed during %s: %s", stage, e)
+            result.failure_stage = stage
+            result.error = str(e)
+        
+        metrics = self.metrics
+        if metrics is not None:
+            for name, seconds in timings.items():
+                metrics.record(name, seconds)
+        return result
+    
+    def _set_status(self, order: Order, status: OrderStatus) -> None:
+        """Memvalidasi transisi lalu mengubah status melalui order_store jika ada.
+        
+        Raises:
+            InvalidTransitionError: Jika transisi tidak diizinkan
+        """
+        check_transition(order.status, status)
+        if self.order_store is None:
+            order.status = status
+        else:
+            self.order_store.update_status(order, status)
+    
+    def run_checkout_many(self, orders: Iterable[Order]) -> List[bool]:
+        """Menjalankan checkout untuk banyak pesanan sekaligus.
+        
+        Versi batch dari run_checkout untuk replay dalam jumlah besar.
+        Banner log per pesanan dilewati dan blok try hanya dimasuki ulang
+        ketika sebuah pesanan gagal, sehingga biaya per pesanan hanya
+        berupa pemanggilan processor dan notifier.
+        
+        Args:
+            orders: Iterable berisi objek Order yang akan diproses
+            
+        Returns:
+            List hasil checkout dengan urutan yang sama seperti input
+        """
+        results: List[bool] = []
+        append = results.append
+        process = self.payment_processor.process
+        send = self.notifier.send
+        set_status = self._set_status
+        remaining = iter(orders)
+        
+        while True:
+            try:
+                for order in remaining:
+                    check_transition(order.status, OrderStatus.PAID)
+                    if process(order):
+                        set_status(order, OrderStatus.PAID)
+                        send(order)
+                        set_status(order, OrderStatus.NOTIFIED)
+                        append(True)
+                    else:
+                        set_status(order, OrderStatus.FAILED)
+                        append(False)
+                break
+            except Exception as e:
+                # Pesanan yang gagal dicatat, lalu loop dilanjutkan
+                # dari pesanan berikutnya
+                logger.error("Checkout process failed: %s", e)
+                append(False)
+        
+        logger.info("Batch checkout completed: %s/%s orders succeeded", sum(results), len(results))
+        return results
+    
+    def run_checkout_batch(self, batch: OrderBatch) -> List[bool]:
+        """Menjalankan checkout untuk seluruh pesanan di OrderBatch.
+        
+        Pesanan dibentuk dari kolom batch, diproses dengan
+        run_checkout_many, lalu kolom status diganti sekaligus dengan
+        status akhir setiap pesanan.
+        
+        Args:
+            batch: OrderBatch yang akan diproses checkout
+            
+        Returns:
+            List hasil checkout dengan urutan yang sama seperti batch
+        """
+        orders = batch.to_orders()
+        results = self.run_checkout_many(orders)
+        codes = _STATUS_CODES
+        batch.statuses = array("B", [codes[order.status] for order in orders])
+        return results
+    
+    async def run_checkout_async(self, order: Order) -> bool:
+        """Versi asynchronous dari run_checkout.
+        
+        Pembayaran dan notifikasi di-await melalui process_async dan
+        send_async, sehingga banyak checkout dapat berjalan bersamaan
+        dalam satu event loop.
+        
+        Args:
+            order: Objek Order yang akan diproses checkout
+            
+        Returns:
+            True jika checkout berhasil, False jika gagal
+        """
+        order_logger.info("=== Starting async checkout for customer: %s ===", order.customer_name)
+        
+        try:
+            check_transition(order.status, OrderStatus.PAID)
+            payment_success = await self.payment_processor.process_async(order)
+            
+            if payment_success:
+                self._set_status(order, OrderStatus.PAID)
+                order_logger.info("Payment successful. Order status updated to: %s", order.status)
+                
+                await self.notifier.send_async(order)
+                self._set_status(order, OrderStatus.NOTIFIED)
+                
+                order_logger.info("Checkout completed successfully for %s", order.customer_name)
+                return True
+            else:
+                self._set_status(order, OrderStatus.FAILED)
+                logger.warning("Payment failed for customer: %s", order.customer_name)
+                return False
+                
+        except Exception as e:
+            logger.error("Checkout process failed: %s", e)
+            return False
+
+
+class ConcurrentCheckoutService:
+    """Service yang menjalankan checkout secara paralel di thread pool.
+    
+    Kelas ini membungkus CheckoutService dan mendelegasikan setiap
+    run_checkout ke ThreadPoolExecutor, sehingga latensi gateway dari
+    beberapa pesanan dapat saling tumpang tindih. Jumlah checkout yang
+    sedang berjalan dibatasi oleh max_in_flight; submit akan menunggu
+    ketika batas tersebut tercapai.
+    
+    Attributes:
+        checkout_service: CheckoutService yang dibungkus
+        max_in_flight: Batas jumlah checkout yang sedang berjalan
+    """
+    
+    def __init__(self, checkout_service: CheckoutService,
+                 max_workers: Optional[int] = None,
+                 max_in_flight: Optional[int] = None):
+        """Menginisialisasi ConcurrentCheckoutService.
+        
+        Args:
+            checkout_service: CheckoutService yang akan dijalankan paralel
+            max_workers: Jumlah thread pada pool, default mengikuti
+                ThreadPoolExecutor
+            max_in_flight: Batas checkout yang sedang berjalan, default
+                dua kali jumlah thread
+        """
+        if max_workers is None:
+            # Sama dengan default ThreadPoolExecutor
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        from concurrent.futures import ThreadPoolExecutor
+        
+        self.checkout_service = checkout_service
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="checkout"
+        )
+        self.max_in_flight = max_in_flight or 2 * max_workers
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        logger.debug("ConcurrentCheckoutService initialized with %s in-flight slots", self.max_in_flight)
+    
+    def submit(self, order: Order,
+               detailed: bool = False) -> "Future[Union[bool, CheckoutResult]]":
+        """Mengirim satu pesanan untuk di-checkout secara paralel.
+        
+        Metode ini memblokir pemanggil ketika jumlah checkout yang sedang
+        berjalan sudah mencapai max_in_flight.
+        
+        Args:
+            order: Objek Order yang akan diproses checkout
+            detailed: Diteruskan ke CheckoutService.run_checkout
+            
+        Returns:
+            Future yang berisi hasil run_checkout
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(
+                self.checkout_service.run_checkout, order, detailed
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release_slot)
+        return future
+    
+    def submit_many(self, orders: Iterable[Order]) -> List["Future[bool]"]:
+        """Mengirim banyak pesanan untuk di-checkout secara paralel.
+        
+        Args:
+            orders: Iterable berisi objek Order yang akan diproses
+            
+        Returns:
+            List Future dengan urutan yang sama seperti input
+        """
+        return [self.submit(order) for order in orders]
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Menghentikan thread pool.
+        
+        Args:
+            wait: Jika True, tunggu semua checkout yang berjalan selesai
+        """
+        self._executor.shutdown(wait=wait)
+    
+    def __enter__(self) -> "ConcurrentCheckoutService":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+    
+    def _release_slot(self, _future: "Future[bool]") -> None:
+        self._slots.release()
+
+
+class IdempotentCheckoutService:
+    """Lapisan idempotency di depan CheckoutService.
+    
+    Checkout yang berhasil dicatat berdasarkan Order.order_id. Pengiriman
+    ulang dengan order_id yang sama (misalnya retry dari klien) langsung
+    mengembalikan hasil yang tersimpan tanpa memanggil payment processor
+    lagi, sehingga tidak terjadi charge ganda. Checkout yang gagal tidak
+    dicatat agar dapat dicoba ulang. Pesanan tanpa order_id diteruskan
+    tanpa perlindungan idempotency. Pesanan duplikat diberi status akhir
+    yang sama dengan checkout yang berhasil (NOTIFIED) melalui validasi
+    transisi dan order_store milik CheckoutService yang dibungkus.
+    
+    Attributes:
+        checkout_service: CheckoutService yang dibungkus
+        max_entries: Jumlah maksimum key di cache LRU memori
+        ttl: Masa berlaku key dalam detik, atau None untuk tanpa batas
+    """
+    
+    def __init__(self, checkout_service: CheckoutService,
+                 max_entries: int = 100_000, ttl: Optional[float] = None,
+                 path: Optional[str] = None):
+        """Menginisialisasi IdempotentCheckoutService.
+        
+        Args:
+            checkout_service: CheckoutService yang dibungkus
+            max_entries: Jumlah maksimum key di cache LRU memori
+            ttl: Masa berlaku key dalam detik, atau None untuk tanpa batas
+            path: Lokasi file SQLite untuk menyimpan key secara persisten,
+                atau None untuk cache memori saja
+        """
+        self.checkout_service = checkout_service
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._cache: "OrderedDict[str, float]" = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._conn: "Optional[sqlite3.Connection]" = None
+        self._pruned_at = time.time()
+        if path is not None:
+            import sqlite3
+            
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS idempotency_keys ("
+                " key TEXT PRIMARY KEY,"
+                " created_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idempotency_keys_created_at"
+                " ON idempotency_keys (created_at)"
+            )
+            self._conn.commit()
+            self._prune(self._pruned_at)
+    
+    def run_checkout(self, order: Order) -> bool:
+        """Menjalankan checkout secara idempotent.
+        
+        Jika order_id yang sama sedang diproses di thread lain, pemanggil
+        menunggu hasilnya alih-alih memanggil payment processor lagi.
+        
+        Args:
+            order: Objek Order yang akan diproses checkout
+            
+        Returns:
+            True jika checkout berhasil (atau sudah pernah berhasil),
+            False jika gagal
+        """
+        key = order.order_id
+        if key is None:
+            return self.checkout_service.run_checkout(order)
+        
+        with self._lock:
+            duplicate = self._lookup(key)
+            done = None
+            if not duplicate:
+                done = self._in_flight.get(key)
+                if done is None:
+                    self._in_flight[key] = threading.Event()
+        
+        if duplicate:
+            self._mark_completed(order)
+            order_logger.info("Duplicate checkout for order %s served from idempotency cache", key)
+            return True
+        if done is not None:
+            # Submission lain dengan key yang sama sedang berjalan
+            done.wait()
+            return self.run_checkout(order)
+        
+        try:
+            result = self.checkout_service.run_checkout(order)
+            if result:
+                with self._lock:
+                    self._remember(key)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key).set()
+    
+    def _mark_completed(self, order: Order) -> None:
+        # Ikuti jalur status checkout yang berhasil (PAID lalu NOTIFIED)
+        # agar transisi divalidasi dan order_store ikut diperbarui
+        set_status = self.checkout_service._set_status
+        if order.status is OrderStatus.NOTIFIED:
+            return
+        if order.status is not OrderStatus.PAID:
+            set_status(order, OrderStatus.PAID)
+        set_status(order, OrderStatus.NOTIFIED)
+    
+    def close(self) -> None:
+        """Menutup koneksi penyimpanan persisten jika ada."""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+            self._conn = None
+    
+    def _lookup(self, key: str) -> bool:
+        # Dipanggil dengan self._lock sudah dipegang
+        now = time.time()
+        created_at = self._cache.get(key)
+        if created_at is None and self._conn is not None:
+            row = self._conn.execute(
+                "SELECT created_at FROM idempotency_keys WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                created_at = row[0]
+                self._cache_put(key, created_at)
+        if created_at is None:
+            return False
+        if self.ttl is not None and now - created_at > self.ttl:
+            del self._cache[key]
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM idempotency_keys WHERE key = ?", (key,))
+            return False
+        self._cache.move_to_end(key)
+        return True
+    
+    def _remember(self, key: str) -> None:
+        # Dipanggil dengan self._lock sudah dipegang
+        created_at = time.time()
+        self._cache_put(key, created_at)
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO idempotency_keys (key, created_at) VALUES (?, ?)",
+                    (key, created_at)
+                )
+            # Key kedaluwarsa dihapus paling sering sekali per ttl, sehingga
+            # tabel tidak tumbuh tanpa batas walaupun key tidak pernah dibaca lagi
+            if self.ttl is not None and created_at - self._pruned_at >= self.ttl:
+                self._prune(created_at)
+    
+    def _prune(self, now: float) -> None:
+        # Dipanggil dari __init__ atau dengan self._lock sudah dipegang
+        self._pruned_at = now
+        if self.ttl is None:
+            return
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM idempotency_keys WHERE created_at < ?", (now - self.ttl,)
+            )
+    
+    def _cache_put(self, key: str, created_at: float) -> None:
+        self._cache[key] = created_at
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+
+class QrisProcessor(IPaymentProcessor):
+    """Implementasi processor pembayaran menggunakan QRIS.
+    
+    Kelas ini menangani logika spesifik untuk pembayaran QRIS
+    dan menunjukkan prinsip Open-Closed (OCP) dimana sistem dapat
+    diperluas tanpa mengubah kode yang sudah ada.
+    """
+    
+    def process(self, order: Order) -> bool:
+        """Memproses pembayaran dengan QRIS.
+        
+        Args:
+            order: Objek Order yang akan diproses
+            
+        Returns:
+            True jika pembayaran QRIS berhasil
+        """
+        order_logger.info("Processing QRIS payment for order: %s", order.customer_name)
+        try:
+            # Simulasi logika pembayaran QRIS
+            order_logger.debug("Generating QR code for amount: %d cents", order.total_price)
+            order_logger.info("QRIS payment processed successfully")
+            return True
+        except Exception as e:
+            logger.error("QRIS payment failed: %s", e)
+            return False
+
+
+class SimulatedLatencyProcessor(IPaymentProcessor):
+    """Decorator IPaymentProcessor yang menambahkan latensi gateway buatan.
+    
+    Digunakan untuk benchmark dan uji beban agar processor simulasi
+    seperti CreditCardProcessor berperilaku seperti gateway sungguhan.
+    
+    Attributes:
+        processor: IPaymentProcessor asli yang dibungkus
+        latency: Callable tanpa argumen yang mengembalikan latensi dalam detik
+    """
+    
+    def __init__(self, processor: IPaymentProcessor, latency: Callable[[], float]):
+        """Menginisialisasi SimulatedLatencyProcessor.
+        
+        Args:
+            processor: IPaymentProcessor asli yang dibungkus
+            latency: Callable tanpa argumen yang mengembalikan latensi
+                dalam detik, misalnya lambda: 0.05
+        """
+        self.processor = processor
+        self.latency = latency
+    
+    def process(self, order: Order) -> bool:
+        """Menunggu selama latensi simulasi lalu memproses pembayaran.
+        
+        Args:
+            order: Objek Order yang akan diproses
+            
+        Returns:
+            Hasil dari processor asli
+        """
+        delay = self.latency()
+        if delay > 0:
+            time.sleep(delay)
+        return self.processor.process(order)
+    
+    def name_for(self, order: Order) -> str:
+        """Nama processor asli yang menangani pesanan."""
+        return self.processor.name_for(order)
 
-# Setup logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
 
+class CircuitOpenError(Exception):
+    """Dilempar ketika circuit breaker terbuka dan panggilan ditolak."""
 
-@dataclass
-class Order:
-    """Data class yang merepresentasikan pesanan pelanggan.
+
+class ResilientPaymentProcessor(IPaymentProcessor):
+    """Decorator IPaymentProcessor dengan retry, timeout, dan circuit breaker.
+    
+    Exception dan timeout dari processor asli dicoba ulang dengan
+    exponential backoff ber-jitter. Pembayaran yang ditolak (False) tidak
+    dicoba ulang karena bukan tanda gateway bermasalah. Setelah
+    failure_threshold kegagalan berturut-turut, circuit terbuka dan
+    panggilan langsung ditolak dengan CircuitOpenError selama
+    reset_timeout detik, lalu satu panggilan percobaan (half-open)
+    menentukan apakah circuit ditutup kembali.
+    
+    Retry setelah timeout dapat menyebabkan charge ganda jika panggilan
+    pertama ternyata berhasil; gunakan bersama order_id dan
+    IdempotentCheckoutService atau gateway yang idempotent.
     
     Attributes:
-        customer_name: Nama pelanggan yang melakukan pesanan
-        total_price: Total harga dari pesanan
-        status: Status pesanan, default adalah 'open'
+        processor: IPaymentProcessor asli yang dibungkus
+        max_retries: Jumlah retry maksimum setelah percobaan pertama
+        timeout: Batas waktu per panggilan dalam detik, atau None
     """
-    customer_name: str
-    total_price: float
-    status: str = "open"
-
-
-class IPaymentProcessor(ABC):
-    """Interface untuk processor pembayaran berdasarkan prinsip DIP.
     
-    Interface ini mendefinisikan kontrak yang harus diimplementasikan
-    oleh semua jenis processor pembayaran berdasarkan prinsip Open-Closed.
+    def __init__(self, processor: IPaymentProcessor, max_retries: int = 3,
+                 base_delay: float = 0.1, max_delay: float = 2.0,
+                 timeout: Optional[float] = None, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0):
+        """Menginisialisasi ResilientPaymentProcessor.
+        
+        Args:
+            processor: IPaymentProcessor asli yang dibungkus
+            max_retries: Jumlah retry maksimum setelah percobaan pertama
+            base_delay: Jeda dasar backoff dalam detik
+            max_delay: Jeda backoff maksimum dalam detik
+            timeout: Batas waktu per panggilan dalam detik, atau None
+            failure_threshold: Jumlah kegagalan berturut-turut sebelum
+                circuit terbuka
+            reset_timeout: Lama circuit terbuka sebelum percobaan ulang
+        """
+        self.processor = processor
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_progress = False
+        self._executor: "Optional[ThreadPoolExecutor]" = None
+        if timeout is not None:
+            from concurrent.futures import ThreadPoolExecutor
+            
+            self._executor = ThreadPoolExecutor(thread_name_prefix="payment-call")
     
-    Methods:
-        process: Memproses pembayaran untuk pesanan tertentu
-    """
+    @property
+    def state(self) -> str:
+        """Status circuit breaker: "closed", "open", atau "half-open"."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return "open"
+            return "half-open"
     
-    @abstractmethod
     def process(self, order: Order) -> bool:
-        """Memproses pembayaran untuk pesanan.
+        """Memproses pembayaran melalui processor asli dengan perlindungan.
         
         Args:
-            order: Objek Order yang akan diproses pembayarannya
+            order: Objek Order yang akan diproses
             
         Returns:
-            True jika pembayaran berhasil, False jika gagal
+            Hasil dari processor asli
             
         Raises:
-            Exception: Jika terjadi kesalahan dalam proses pembayaran
+            CircuitOpenError: Jika circuit sedang terbuka
+            Exception: Error terakhir jika semua retry gagal
         """
-        pass
+        attempt = 0
+        while True:
+            self._before_call()
+            try:
+                result = self._call(order)
+            except Exception as e:
+                circuit_opened = self._record_failure()
+                if attempt >= self.max_retries or circuit_opened:
+                    raise
+                # Full jitter: jeda acak antara 0 dan batas backoff
+                import random
+                
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                logger.warning(
+                    "Payment attempt %s via %s failed: %s; retrying in %.3fs",
+                    attempt + 1, type(self.processor).__name__, e, delay
+                )
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._record_success()
+            return result
+    
+    def name_for(self, order: Order) -> str:
+        """Nama processor asli yang menangani pesanan."""
+        return self.processor.name_for(order)
+    
+    def close(self, wait: bool = False) -> None:
+        """Menghentikan thread pool yang dipakai untuk timeout per panggilan.
+        
+        Args:
+            wait: Jika True, tunggu panggilan yang masih berjalan selesai
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+    
+    def __enter__(self) -> "ResilientPaymentProcessor":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _call(self, order: Order) -> bool:
+        if self._executor is None:
+            return self.processor.process(order)
+        # Sebelum Python 3.11 TimeoutError dari future adalah kelas sendiri
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+        
+        future = self._executor.submit(self.processor.process, order)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(
+                f"{type(self.processor).__name__} did not respond within {self.timeout}s"
+            ) from None
+    
+    def _before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if (time.monotonic() - self._opened_at < self.reset_timeout
+                    or self._trial_in_progress):
+                raise CircuitOpenError(
+                    f"Circuit open for {type(self.processor).__name__}"
+                )
+            # Half-open: hanya satu panggilan percobaan yang diizinkan
+            self._trial_in_progress = True
+    
+    def _record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Circuit closed for %s", type(self.processor).__name__)
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+    
+    def _record_failure(self) -> bool:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_progress or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_progress:
+                    logger.warning("Circuit opened for %s", type(self.processor).__name__)
+                self._opened_at = time.monotonic()
+                self._trial_in_progress = False
+                return True
+            return False
 
 
-class INotificationService(ABC):
-    """Interface untuk layanan notifikasi berdasarkan prinsip DIP.
+class RateLimitedPaymentProcessor(IPaymentProcessor):
+    """Decorator IPaymentProcessor yang membatasi laju panggilan ke gateway.
     
-    Interface ini mendefinisikan kontrak yang harus diimplementasikan
-    oleh semua jenis layanan notifikasi berdasarkan prinsip Open-Closed.
+    Memakai token bucket per instance: token bertambah sebanyak rate per
+    detik hingga maksimum burst, dan setiap panggilan process memakai satu
+    token. Jika token habis, pemanggil menunggu giliran sehingga panggilan
+    ke gateway diratakan sesuai TPS kontrak alih-alih dikirim sekaligus
+    lalu ditolak gateway (HTTP 429).
     
-    Methods:
-        send: Mengirim notifikasi kepada pelanggan
+    Giliran dipesan di bawah lock lalu ditunggu di luar lock, sehingga
+    pemanggil dari banyak thread maupun coroutine dilayani berurutan tanpa
+    saling memblokir saat menunggu. Bagikan satu instance ke semua
+    CheckoutService yang memakai gateway yang sama agar batasnya berlaku
+    bersama.
+    
+    Attributes:
+        processor: IPaymentProcessor asli yang dibungkus
+        rate: Jumlah panggilan per detik yang diizinkan
+        burst: Kapasitas bucket, yaitu jumlah panggilan beruntun maksimum
     """
     
-    @abstractmethod
-    def send(self, order: Order) -> None:
-        """Mengirim notifikasi kepada pelanggan.
+    def __init__(self, processor: IPaymentProcessor, rate: float,
+                 burst: Optional[int] = None):
+        """Menginisialisasi RateLimitedPaymentProcessor.
         
         Args:
-            order: Objek Order yang menjadi konteks notifikasi
+            processor: IPaymentProcessor asli yang dibungkus
+            rate: Jumlah panggilan per detik yang diizinkan gateway
+            burst: Kapasitas bucket, default 1 (panggilan diratakan penuh)
+        
+        Raises:
+            ValueError: Jika rate atau burst tidak positif
         """
-        pass
-
-
-class CreditCardProcessor(IPaymentProcessor):
-    """Implementasi processor pembayaran menggunakan kartu kredit.
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst is None:
+            burst = 1
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.processor = processor
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        # Bucket dimulai penuh; nilai negatif berarti token sudah dipesan
+        # oleh pemanggil yang sedang menunggu
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
     
-    Kelas ini menangani logika spesifik untuk pembayaran kartu kredit
-    dan menunjukkan penerapan prinsip Single Responsibility.
-    """
+    def _reserve(self, timeout: Optional[float]) -> Optional[float]:
+        """Memesan satu token dan menghitung lama tunggu.
+        
+        Args:
+            timeout: Lama tunggu maksimum dalam detik, atau None
+        
+        Returns:
+            Lama tunggu dalam detik, atau None jika melebihi timeout
+            (token tidak dipesan)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            wait = (1 - self._tokens) / self.rate
+            if timeout is not None and wait > timeout:
+                return None
+            self._tokens -= 1
+            return max(wait, 0.0)
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Mengambil satu token, memblokir thread sampai token tersedia.
+        
+        Args:
+            timeout: Lama tunggu maksimum dalam detik, atau None untuk
+                menunggu tanpa batas
+        
+        Returns:
+            True jika token didapat, False jika tidak tersedia dalam timeout
+        """
+        wait = self._reserve(timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+    
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        """Versi asynchronous dari acquire yang tidak memblokir event loop.
+        
+        Args:
+            timeout: Lama tunggu maksimum dalam detik, atau None untuk
+                menunggu tanpa batas
+        
+        Returns:
+            True jika token didapat, False jika tidak tersedia dalam timeout
+        """
+        import asyncio
+        
+        wait = self._reserve(timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
     
     def process(self, order: Order) -> bool:
-        """Memproses pembayaran dengan kartu kredit.
+        """Menunggu giliran sesuai batas laju lalu memproses pembayaran.
         
         Args:
             order: Objek Order yang akan diproses
-            
+        
         Returns:
-            True jika pembayaran kartu kredit berhasil
+            Hasil dari processor asli
         """
-        logger.info(f"Processing credit card payment for order: {order.customer_name}")
-        try:
-            # Simulasi logika pembayaran kartu kredit
-            logger.debug(f"Amount to charge: ${order.total_price}")
-            logger.info("Credit card payment processed successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Credit card payment failed: {str(e)}")
-            return False
+        self.acquire()
+        return self.processor.process(order)
+    
+    async def process_async(self, order: Order) -> bool:
+        """Versi asynchronous dari process.
+        
+        Menunggu token dengan asyncio.sleep lalu memanggil process_async
+        milik processor asli.
+        
+        Args:
+            order: Objek Order yang akan diproses
+        
+        Returns:
+            Hasil dari processor asli
+        """
+        await self.acquire_async()
+        return await self.processor.process_async(order)
+    
+    def name_for(self, order: Order) -> str:
+        """Nama processor asli yang menangani pesanan."""
+        return self.processor.name_for(order)
 
 
-class EmailNotifier(INotificationService):
-    """Implementasi layanan notifikasi melalui email.
+class PaymentProcessorRegistry:
+    """Registry yang memetakan kunci metode pembayaran ke factory processor.
     
-    Kelas ini menangani pengiriman notifikasi melalui email
-    dan menunjukkan penerapan prinsip Single Responsibility.
+    Factory dapat berupa callable atau string "modul:atribut". Modul baru
+    di-import dan processor baru dibuat saat metode tersebut pertama kali
+    dipakai, lalu instance yang sama dipakai ulang, sehingga SDK gateway
+    yang tidak dipakai tidak memperlambat start worker.
     """
     
-    def send(self, order: Order) -> None:
-        """Mengirim notifikasi email konfirmasi.
+    def __init__(self):
+        self._factories: Dict[str, Union[str, Callable[[], IPaymentProcessor]]] = {}
+        self._instances: Dict[str, IPaymentProcessor] = {}
+        self._lock = threading.Lock()
+        # Naik setiap register, agar cache di luar registry (misalnya
+        # tabel RoutingPaymentProcessor) tahu kapan harus dibuang
+        self.generation = 0
+    
+    def register(self, method: str,
+                 factory: Union[str, Callable[[], IPaymentProcessor]]) -> None:
+        """Mendaftarkan factory untuk sebuah metode pembayaran.
         
         Args:
-            order: Objek Order yang akan dikirim notifikasinya
+            method: Kunci metode pembayaran, misalnya "card" atau "qris"
+            factory: Callable tanpa argumen yang membuat IPaymentProcessor,
+                atau string "modul:atribut" yang di-import saat pertama dipakai
         """
-        logger.info(f"Sending confirmation email to: {order.customer_name}")
-        # Simulasi pengiriman email
-        logger.debug(f"Email content: Order #{order.customer_name} confirmed")
-        logger.info("Email notification sent successfully")
+        with self._lock:
+            self._factories[method] = factory
+            self._instances.pop(method, None)
+            self.generation += 1
+    
+    def get(self, method: str) -> IPaymentProcessor:
+        """Mengambil processor untuk sebuah metode, membuatnya bila perlu.
+        
+        Args:
+            method: Kunci metode pembayaran
+            
+        Returns:
+            Instance IPaymentProcessor yang dipakai bersama
+            
+        Raises:
+            KeyError: Jika metode belum terdaftar
+        """
+        processor = self._instances.get(method)
+        if processor is not None:
+            return processor
+        with self._lock:
+            processor = self._instances.get(method)
+            if processor is None:
+                if method not in self._factories:
+                    raise KeyError(f"Unknown payment method: {method!r}")
+                factory = self._factories[method]
+                if isinstance(factory, str):
+                    module_name, _, attribute = factory.partition(":")
+                    import importlib
+                    
+                    factory = getattr(importlib.import_module(module_name), attribute)
+                processor = self._instances[method] = factory()
+                logger.debug("Payment processor for %r loaded: %s", method, type(processor).__name__)
+            return processor
+    
+    def methods(self) -> List[str]:
+        """Mengembalikan semua kunci metode pembayaran yang terdaftar."""
+        return list(self._factories)
+    
+    def __contains__(self, method: str) -> bool:
+        return method in self._factories
 
 
-class CheckoutService:
-    """Service untuk mengkoordinasi proses checkout berdasarkan prinsip SRP.
+def default_processor_registry() -> PaymentProcessorRegistry:
+    """Membuat registry berisi processor bawaan ("card" dan "qris").
     
-    Kelas ini bertanggung jawab tunggal untuk mengkoordinasi proses checkout,
-    termasuk pembayaran dan notifikasi berdasarkan prinsip Dependency Injection.
+    Returns:
+        PaymentProcessorRegistry baru
+    """
+    registry = PaymentProcessorRegistry()
+    registry.register("card", CreditCardProcessor)
+    registry.register("qris", QrisProcessor)
+    return registry
+
+
+class RoutingPaymentProcessor(IPaymentProcessor):
+    """Processor yang meneruskan setiap pesanan sesuai Order.payment_method.
+    
+    Dengan processor ini satu CheckoutService dapat melayani semua metode
+    pembayaran. Tabel metode ke fungsi process diisi sekali per metode,
+    sehingga setiap pesanan berikutnya hanya memerlukan satu lookup
+    dictionary. Tabel dikosongkan ketika registry berubah (register
+    ulang sebuah metode), sehingga processor baru langsung dipakai.
     
     Attributes:
-        payment_processor: Processor pembayaran yang diinject
-        notifier: Layanan notifikasi yang diinject
+        registry: PaymentProcessorRegistry sumber processor
+        default_method: Metode untuk pesanan tanpa payment_method, atau None
     """
     
-    def __init__(self, payment_processor: IPaymentProcessor, 
-                 notifier: INotificationService):
-        """Menginisialisasi CheckoutService dengan dependency injection.
+    def __init__(self, registry: PaymentProcessorRegistry,
+                 default_method: Optional[str] = None):
+        """Menginisialisasi RoutingPaymentProcessor.
         
         Args:
-            payment_processor: Implementasi IPaymentProcessor untuk pembayaran
-            notifier: Implementasi INotificationService untuk notifikasi
+            registry: PaymentProcessorRegistry sumber processor
+            default_method: Metode untuk pesanan tanpa payment_method
         """
-        self.payment_processor = payment_processor
-        self.notifier = notifier
-        logger.debug(f"CheckoutService initialized with {type(payment_processor).__name__}")
+        self.registry = registry
+        self.default_method = default_method
+        self._table: Dict[Optional[str], Callable[[Order], bool]] = {}
+        self._generation = registry.generation
     
-    def run_checkout(self, order: Order) -> bool:
-        """Menjalankan proses checkout lengkap.
+    def process(self, order: Order) -> bool:
+        """Memproses pembayaran dengan processor sesuai metode pesanan.
         
-        Metode ini mengkoordinasi proses pembayaran dan pengiriman notifikasi.
+        Args:
+            order: Objek Order yang akan diproses
+            
+        Returns:
+            Hasil dari processor metode tersebut
+            
+        Raises:
+            KeyError: Jika metode pembayaran tidak terdaftar
+        """
+        if self._generation != self.registry.generation:
+            self._reset_table()
+        method = order.payment_method or self.default_method
+        process = self._table.get(method)
+        if process is None:
+            process = self._table[method] = self.registry.get(method).process
+        return process(order)
+    
+    def processor_for(self, order: Order) -> IPaymentProcessor:
+        """Mengambil processor yang akan menangani pesanan.
         
         Args:
-            order: Objek Order yang akan diproses checkout
+            order: Objek Order
             
         Returns:
-            True jika checkout berhasil, False jika gagal
+            IPaymentProcessor untuk metode pembayaran pesanan
+            
+        Raises:
+            KeyError: Jika metode pembayaran tidak terdaftar
         """
-        logger.info(f"=== Starting checkout for customer: {order.customer_name} ===")
-        logger.debug(f"Order details: Amount ${order.total_price}, Status: {order.status}")
+        return self.registry.get(order.payment_method or self.default_method)
+    
+    def name_for(self, order: Order) -> str:
+        """Nama processor yang dipilih untuk pesanan.
         
+        Metode yang tidak terdaftar dilaporkan dengan nama router, karena
+        process akan gagal sebelum processor mana pun dipanggil.
+        """
         try:
-            # Process payment
-            logger.info("Processing payment...")
-            payment_success = self.payment_processor.process(order)
-            
-            if payment_success:
-                order.status = "paid"
-                logger.info(f"Payment successful. Order status updated to: {order.status}")
-                
-                # Send notification
-                logger.info("Sending notification...")
-                self.notifier.send(order)
-                
-                logger.info(f"Checkout completed successfully for {order.customer_name}")
-                return True
-            else:
-                logger.warning(f"Payment failed for customer: {order.customer_name}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Checkout process failed: {str(e)}")
-            return False
+            processor = self.processor_for(order)
+        except KeyError:
+            return type(self).__name__
+        return processor.name_for(order)
+    
+    def _reset_table(self) -> None:
+        self._generation = self.registry.generation
+        self._table = {}
+    
+    def warm_up(self) -> None:
+        """Memuat semua processor terdaftar dan mengisi tabel sekarang juga."""
+        self._reset_table()
+        for method in self.registry.methods():
+            self._table[method] = self.registry.get(method).process
+        if self.default_method is not None:
+            self._table[None] = self._table[self.default_method]
 
 
-class QrisProcessor(IPaymentProcessor):
-    """Implementasi processor pembayaran menggunakan QRIS.
+def _parse_cents(value) -> int:
+    """Membaca total_price hasil ingest sebagai integer sen.
     
-    Kelas ini menangani logika spesifik untuk pembayaran QRIS
-    dan menunjukkan prinsip Open-Closed (OCP) dimana sistem dapat
-    diperluas tanpa mengubah kode yang sudah ada.
+    Dipakai oleh cabang JSONL dan CSV agar aturan keduanya sama: hanya
+    integer (atau string berisi integer) yang diterima, sehingga nilai
+    pecahan seperti 100.75 ditolak alih-alih dipotong diam-diam.
+    
+    Args:
+        value: Nilai total_price dari baris input
+        
+    Returns:
+        Total harga dalam sen
+        
+    Raises:
+        ValueError: Jika nilai bukan integer sen
     """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        digits = text[1:] if text[:1] in ("+", "-") else text
+        if digits.isdigit():
+            return int(text)
+    raise ValueError(f"total_price must be an integer number of cents, got {value!r}")
+
+
+def _iter_order_rows(path: str) -> Iterator[tuple]:
+    """Membaca baris pesanan dari file JSONL atau CSV secara streaming.
     
-    def process(self, order: Order) -> bool:
-        """Memproses pembayaran dengan QRIS.
+    Format ditentukan dari ekstensi file: .jsonl/.ndjson untuk JSON Lines
+    dan .csv untuk CSV dengan header. Kolom yang dikenali adalah
+    customer_name, total_price (integer sen), serta status, order_id,
+    dan payment_method yang opsional.
+    
+    Yields:
+        Tuple (customer_name, total_price, status, order_id, payment_method)
         
-        Args:
-            order: Objek Order yang akan diproses
+    Raises:
+        ValueError: Jika format file tidak didukung, kolom wajib tidak ada,
+            atau sebuah baris tidak valid; pesan berisi path dan nomor
+            baris agar baris yang rusak mudah ditemukan
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline="", encoding="utf-8") as f:
+        if extension in (".jsonl", ".ndjson"):
+            import json
             
-        Returns:
-            True jika pembayaran QRIS berhasil
-        """
-        logger.info(f"Processing QRIS payment for order: {order.customer_name}")
-        try:
-            # Simulasi logika pembayaran QRIS
-            logger.debug(f"Generating QR code for amount: ${order.total_price}")
-            logger.info("QRIS payment processed successfully")
-            return True
-        except Exception as e:
-            logger.error(f"QRIS payment failed: {str(e)}")
-            return False
+            loads = json.loads
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = loads(line)
+                    record = (
+                        row["customer_name"],
+                        _parse_cents(row["total_price"]),
+                        OrderStatus(row.get("status") or OrderStatus.OPEN),
+                        row.get("order_id"),
+                        row.get("payment_method"),
+                    )
+                except KeyError as e:
+                    raise ValueError(f"{path}:{line_number}: missing field {e}") from None
+                except (ValueError, TypeError, AttributeError) as e:
+                    raise ValueError(f"{path}:{line_number}: {e}") from e
+                yield record
+        elif extension == ".csv":
+            import csv
+            
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            columns = {name.strip(): index for index, name in enumerate(header)}
+            missing = [name for name in ("customer_name", "total_price") if name not in columns]
+            if missing:
+                raise ValueError(f"{path}:1: missing required column(s): {', '.join(missing)}")
+            name_col = columns["customer_name"]
+            price_col = columns["total_price"]
+            status_col = columns.get("status")
+            id_col = columns.get("order_id")
+            method_col = columns.get("payment_method")
+            width = max(index for index in (name_col, price_col, status_col, id_col, method_col)
+                        if index is not None) + 1
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < width:
+                    raise ValueError(
+                        f"{path}:{reader.line_num}: expected at least {width} fields, got {len(row)}"
+                    )
+                status = row[status_col] if status_col is not None else ""
+                order_id = row[id_col] if id_col is not None else ""
+                method = row[method_col] if method_col is not None else ""
+                try:
+                    record = (
+                        row[name_col],
+                        _parse_cents(row[price_col]),
+                        OrderStatus(status or OrderStatus.OPEN),
+                        order_id or None,
+                        method or None,
+                    )
+                except ValueError as e:
+                    raise ValueError(f"{path}:{reader.line_num}: {e}") from e
+                yield record
+        else:
+            raise ValueError(f"Unsupported order file format: {path}")
+
+
+def iter_orders(path: str) -> Iterator[Order]:
+    """Membaca pesanan dari file JSONL atau CSV satu per satu.
+    
+    File dibaca baris demi baris sehingga penggunaan memori tetap konstan
+    berapa pun ukuran file.
+    
+    Args:
+        path: Lokasi file .jsonl, .ndjson, atau .csv
+        
+    Yields:
+        Objek Order untuk setiap baris
+    """
+    for name, price, status, order_id, method in _iter_order_rows(path):
+        yield Order(name, price, status, order_id, method)
+
+
+def iter_order_batches(path: str, batch_size: int = 10_000) -> Iterator[OrderBatch]:
+    """Membaca pesanan dari file langsung ke OrderBatch berukuran tetap.
+    
+    Baris diurai langsung ke kolom tanpa membuat objek Order, sehingga
+    memori yang dipakai dibatasi oleh batch_size.
+    
+    Args:
+        path: Lokasi file .jsonl, .ndjson, atau .csv
+        batch_size: Jumlah pesanan maksimum per batch
+        
+    Yields:
+        OrderBatch berisi paling banyak batch_size pesanan
+    """
+    rows = _iter_order_rows(path)
+    codes = _STATUS_CODES
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            return
+        names, prices, statuses, order_ids, methods = zip(*chunk)
+        yield OrderBatch(
+            list(names),
+            array("q", prices),
+            array("B", [codes[status] for status in statuses]),
+            list(order_ids),
+            list(methods)
+        )
+
+
+def ingest_orders(path: str, checkout_service: CheckoutService,
+                  batch_size: int = 10_000) -> Tuple[int, int]:
+    """Menjalankan checkout untuk semua pesanan di file secara streaming.
+    
+    Args:
+        path: Lokasi file .jsonl, .ndjson, atau .csv
+        checkout_service: CheckoutService yang memproses pesanan
+        batch_size: Jumlah pesanan per batch checkout
+        
+    Returns:
+        Tuple (jumlah pesanan diproses, jumlah checkout berhasil)
+    """
+    processed = succeeded = 0
+    for batch in iter_order_batches(path, batch_size):
+        results = checkout_service.run_checkout_batch(batch)
+        processed += len(results)
+        succeeded += sum(results)
+    logger.info("Ingested %s orders from %s: %s succeeded", processed, path, succeeded)
+    return processed, succeeded
+
+
+class ShardWorkerError(RuntimeError):
+    """Dilempar ketika worker run_checkout_sharded gagal atau berhenti mendadak."""
+
+
+def _sharded_checkout_worker(processor_factory: Callable[[], IPaymentProcessor],
+                             notifier_factory: Callable[[], INotificationService],
+                             inbox, outbox) -> None:
+    """Loop worker untuk run_checkout_sharded.
+    
+    Setiap worker membangun CheckoutService, processor, dan notifier
+    sendiri, lalu memproses batch pesanan dari inbox secara berurutan.
+    Hasil dikirim balik sebagai list tuple (index, hasil, status). Jika
+    terjadi exception, traceback-nya dikirim sebagai string lalu worker
+    berhenti.
+    """
+    try:
+        service = CheckoutService(
+            payment_processor=processor_factory(),
+            notifier=notifier_factory()
+        )
+        for batch in iter(inbox.get, None):
+            results = service.run_checkout_many(order for _, order in batch)
+            outbox.put([
+                (index, success, order.status)
+                for (index, order), success in zip(batch, results)
+            ])
+    except BaseException:
+        import traceback
+        
+        outbox.put(traceback.format_exc())
 
 
-def main():
-    """Fungsi utama untuk menjalankan demo sistem checkout.
+def _check_shard_workers(processes: list) -> bool:
+    """Memastikan worker run_checkout_sharded tidak berhenti mendadak.
     
-    Fungsi ini menunjukkan penggunaan sistem dengan berbagai metode pembayaran
-    dan mengilustrasikan penerapan prinsip SOLID dalam praktik.
+    Args:
+        processes: Daftar multiprocessing.Process worker
+        
+    Returns:
+        True jika semua worker sudah selesai dengan exit code nol
+        
+    Raises:
+        ShardWorkerError: Jika ada worker yang berhenti dengan exit code
+            bukan nol
+    """
+    for process in processes:
+        if process.exitcode not in (None, 0):
+            raise ShardWorkerError(
+                f"Sharded checkout worker {process.pid} exited with code {process.exitcode}"
+            )
+    return all(process.exitcode is not None for process in processes)
+
+
+def run_checkout_sharded(orders: Iterable[Order],
+                         processor_factory: Callable[[], IPaymentProcessor],
+                         notifier_factory: Callable[[], INotificationService],
+                         workers: Optional[int] = None,
+                         batch_size: int = 256) -> List[bool]:
+    """Menjalankan checkout di beberapa proses yang di-shard per pelanggan.
+    
+    Pesanan dibagi ke worker berdasarkan hash stabil dari customer_name,
+    sehingga semua pesanan milik satu pelanggan selalu diproses oleh
+    worker yang sama dengan urutan sesuai input. Cocok untuk processor
+    yang CPU-bound (misalnya fraud check atau signing) karena setiap
+    worker memiliki GIL sendiri.
+    
+    Args:
+        orders: Iterable berisi objek Order yang akan diproses
+        processor_factory: Callable yang dapat di-pickle untuk membuat
+            IPaymentProcessor di setiap worker, misalnya CreditCardProcessor
+        notifier_factory: Callable yang dapat di-pickle untuk membuat
+            INotificationService di setiap worker, misalnya EmailNotifier
+        workers: Jumlah proses worker, default jumlah CPU
+        batch_size: Jumlah pesanan per pesan antar proses
+        
+    Returns:
+        List hasil checkout dengan urutan yang sama seperti input. Status
+        setiap Order di proses pemanggil ikut diperbarui.
+        
+    Raises:
+        ShardWorkerError: Jika worker melempar exception (misalnya factory
+            gagal) atau berhenti sebelum mengirim semua hasil (misalnya
+            dibunuh OOM killer); worker lain dihentikan
+    """
+    import multiprocessing
+    import queue
+    
+    workers = workers or os.cpu_count() or 1
+    outbox = multiprocessing.Queue()
+    inboxes = [multiprocessing.Queue() for _ in range(workers)]
+    processes = [
+        multiprocessing.Process(
+            target=_sharded_checkout_worker,
+            args=(processor_factory, notifier_factory, inbox, outbox),
+            daemon=True
+        )
+        for inbox in inboxes
+    ]
+    for process in processes:
+        process.start()
+    logger.info("Sharded checkout started with %s worker processes", workers)
+    
+    submitted: List[Order] = []
+    pending = [[] for _ in range(workers)]
+    for index, order in enumerate(orders):
+        submitted.append(order)
+        # crc32 dipakai karena hash() untuk str berbeda antar proses
+        shard = zlib.crc32(order.customer_name.encode()) % workers
+        batch = pending[shard]
+        batch.append((index, order))
+        if len(batch) >= batch_size:
+            inboxes[shard].put(batch)
+            pending[shard] = []
+    for inbox, batch in zip(inboxes, pending):
+        if batch:
+            inbox.put(batch)
+        inbox.put(None)
+    
+    results = [False] * len(submitted)
+    received = 0
+    workers_done = False
+    try:
+        while received < len(submitted):
+            try:
+                message = outbox.get(timeout=0.5)
+            except queue.Empty:
+                if workers_done:
+                    raise ShardWorkerError(
+                        "Sharded checkout workers exited before returning all results"
+                    ) from None
+                # Tidak ada hasil baru: pastikan worker masih hidup agar
+                # pemanggil tidak menunggu selamanya. Worker yang sudah
+                # selesai normal telah menulis hasil terakhirnya ke pipe,
+                # jadi outbox dibaca sampai kosong sebelum dianggap hilang
+                workers_done = _check_shard_workers(processes)
+                continue
+            if isinstance(message, str):
+                raise ShardWorkerError(f"Sharded checkout worker failed:\n{message}")
+            for index, success, status in message:
+                results[index] = success
+                submitted[index].status = status
+                received += 1
+    except BaseException:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        raise
+    for process in processes:
+        process.join()
+    
+    logger.info("Sharded checkout completed: %s/%s orders succeeded", sum(results), len(results))
+    return results
+
+
+def _parse_latency(spec: str, rng: "random.Random") -> Callable[[], float]:
+    """Mengubah spesifikasi distribusi latensi menjadi callable.
+    
+    Format yang didukung (dalam detik): "none", "fixed:D",
+    "uniform:MIN,MAX", "exponential:MEAN", dan "lognormal:MU,SIGMA".
+    
+    Raises:
+        ValueError: Jika format spesifikasi tidak dikenali
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    if kind == "none" and not values:
+        return lambda: 0.0
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "exponential" and len(values) == 1:
+        return lambda: rng.expovariate(1 / values[0])
+    if kind == "lognormal" and len(values) == 2:
+        return lambda: rng.lognormvariate(values[0], values[1])
+    raise ValueError(f"Invalid latency distribution: {spec!r}")
+
+
+def _parse_mix(spec: str, registry: PaymentProcessorRegistry) -> Dict[str, float]:
+    """Mengubah spesifikasi campuran processor seperti "card=0.7,qris=0.3".
+    
+    Raises:
+        ValueError: Jika nama processor tidak dikenal atau bobot tidak valid
     """
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in registry:
+            raise ValueError(f"Unknown processor {name!r}, choose from {sorted(registry.methods())}")
+        mix[name] = float(weight) if weight else 1.0
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError(f"Invalid processor mix: {spec!r}")
+    return mix
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Load generator untuk menguji kapasitas CheckoutService.
     
-    logger.info("=== Starting Checkout System Demo ===")
+    Menjalankan beban sintetis dengan jumlah pesanan, tingkat konkurensi,
+    campuran processor, dan distribusi latensi gateway yang dapat diatur,
+    lalu mencetak ringkasan throughput dan latensi.
     
-    # Setup dependencies
-    andi_order = Order("Andi", 500000)
-    budi_order = Order("Budi", 100000)
-    email_service = EmailNotifier()
+    Args:
+        argv: Argumen command line, default sys.argv[1:]
+    """
+    import argparse
+    import random
     
-    # Scenario 1: Credit Card Payment
-    logger.info("\n--- Scenario 1: Credit Card Payment ---")
-    cc_processor = CreditCardProcessor()
-    checkout_cc = CheckoutService(
-        payment_processor=cc_processor, 
-        notifier=email_service
+    parser = argparse.ArgumentParser(
+        description="Run a synthetic checkout load against CheckoutService."
     )
-    result1 = checkout_cc.run_checkout(andi_order)
-    logger.info(f"Credit Card Checkout Result: {'SUCCESS' if result1 else 'FAILED'}")
-    
-    # Scenario 2: QRIS Payment (Demonstrasi OCP)
-    logger.info("\n--- Scenario 2: QRIS Payment (OCP Demonstration) ---")
-    qris_processor = QrisProcessor()
-    checkout_qris = CheckoutService(
-        payment_processor=qris_processor, 
-        notifier=email_service
+    parser.add_argument("--orders", type=int, default=1000,
+                        help="jumlah pesanan sintetis (default: 1000)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="jumlah checkout paralel (default: 1)")
+    parser.add_argument("--mix", default="card=1,qris=1",
+                        help='bobot processor, misalnya "card=0.7,qris=0.3"')
+    parser.add_argument("--latency", default="none",
+                        help='distribusi latensi gateway dalam detik: none, fixed:D, '
+                             'uniform:MIN,MAX, exponential:MEAN, lognormal:MU,SIGMA')
+    parser.add_argument("--log-level", default="WARNING",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="level logging (default: WARNING)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed random agar run dapat diulang")
+    args = parser.parse_args(argv)
+    
+    registry = default_processor_registry()
+    try:
+        mix = _parse_mix(args.mix, registry)
+        rng = random.Random(args.seed)
+        latency = _parse_latency(args.latency, rng)
+    except ValueError as e:
+        parser.error(str(e))
+    configure_logging(level=args.log_level)
+    
+    # Setiap processor dibungkus latensi simulasi saat pertama kali dipakai
+    load_registry = PaymentProcessorRegistry()
+    for name in mix:
+        load_registry.register(
+            name,
+            lambda name=name: SimulatedLatencyProcessor(registry.get(name), latency)
+        )
+    service = CheckoutService(
+        payment_processor=RoutingPaymentProcessor(load_registry),
+        notifier=EmailNotifier()
     )
-    result2 = checkout_qris.run_checkout(budi_order)
-    logger.info(f"QRIS Checkout Result: {'SUCCESS' if result2 else 'FAILED'}")
+    methods = rng.choices(list(mix), list(mix.values()), k=args.orders)
+    orders = [
+        Order(f"customer-{i % 1000}", rng.randrange(1_000, 10_000_000), payment_method=method)
+        for i, method in enumerate(methods)
+    ]
+    
+    # Latensi diukur dari submit sampai selesai (wall clock), termasuk
+    # antrian executor dan logging, seperti yang dialami pemanggil
+    latencies = [0.0] * len(orders)
+    
+    def record_latency(index: int, submitted_at: float) -> Callable[["Future"], None]:
+        def done(_future: "Future") -> None:
+            latencies[index] = time.perf_counter() - submitted_at
+        return done
+    
+    started = time.perf_counter()
+    if args.concurrency > 1:
+        with ConcurrentCheckoutService(service, max_workers=args.concurrency) as pool:
+            futures = []
+            for index, order in enumerate(orders):
+                submitted_at = time.perf_counter()
+                future = pool.submit(order, detailed=True)
+                future.add_done_callback(record_latency(index, submitted_at))
+                futures.append(future)
+            results = [future.result() for future in futures]
+    else:
+        results = []
+        for index, order in enumerate(orders):
+            submitted_at = time.perf_counter()
+            results.append(service.run_checkout(order, detailed=True))
+            latencies[index] = time.perf_counter() - submitted_at
+    elapsed = time.perf_counter() - started
     
-    logger.info("=== Checkout System Demo Completed ===")
+    latencies.sort()
+    succeeded = sum(1 for result in results if result)
+    print(f"Orders       : {len(results)} ({succeeded} succeeded, {len(results) - succeeded} failed)")
+    print(f"Concurrency  : {args.concurrency}")
+    print(f"Processor mix: {', '.join(f'{name}={weight:g}' for name, weight in mix.items())}")
+    per_processor: Dict[str, int] = {}
+    for result in results:
+        per_processor[result.processor] = per_processor.get(result.processor, 0) + 1
+    print(f"Per processor: {', '.join(f'{name}={count}' for name, count in sorted(per_processor.items()))}")
+    print(f"Latency      : {args.latency}")
+    print(f"Elapsed      : {elapsed:.3f} s")
+    print(f"Throughput   : {len(results) / elapsed if elapsed else 0:.1f} checkouts/s")
+    print(f"Latency p50  : {_percentile(latencies, 50) * 1e3:.3f} ms")
+    print(f"Latency p95  : {_percentile(latencies, 95) * 1e3:.3f} ms")
+    print(f"Latency p99  : {_percentile(latencies, 99) * 1e3:.3f} ms")
+    print(f"Latency max  : {(latencies[-1] if latencies else 0) * 1e3:.3f} ms")
 
 
 if __name__ == "__main__":